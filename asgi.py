@@ -0,0 +1,6 @@
+from server.async_app import create_async_app
+
+
+# Async read-only app, see server/async_app.py
+#   hypercorn asgi:app
+app = create_async_app()
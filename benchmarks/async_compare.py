@@ -0,0 +1,161 @@
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Importing bench sets the environment defaults (local SQLite, cheap bcrypt, ...)
+from benchmarks.bench import percentile
+from benchmarks.seed import SCALES, seed
+
+
+# Compares the sync app with the async read app (server/async_app.py) on the read
+# routes they share, at increasing numbers of concurrent clients.
+#
+#   pip install -r requirements-async.txt
+#   python -m benchmarks.async_compare --scale small --concurrency 1,16,64 --requests 400
+#
+# The sync app is driven by one thread per client, the async app by one task per
+# client on a single event loop, both in this process. Note the sync availability
+# routes answer from the in-memory availability index while the async ones query
+# the database.
+
+
+def read_paths(data, session, token_for):
+    from server.classes import Appointment
+    from datetime import date
+
+    barber_id = data['barber_ids'][1] if len(data['barber_ids']) > 1 else data['barber_ids'][0]
+    appointment_id = session.query(Appointment.Appointment_ID).filter_by(Barber_User_ID=barber_id).first()[0]
+    day = date.today().isoformat()
+    auth = {'Authorization': f'Bearer {token_for(barber_id, "barber")}'}
+    return [
+        ('/services', None),
+        (f'/services/{barber_id}', None),
+        ('/payment-methods', None),
+        (f'/schedule/{barber_id}/available-dates', None),
+        (f'/availabletimeslots/{barber_id}/{day}', None),
+        (f'/dailyappointments/{barber_id}/{day}', None),
+        (f'/weeklyappointments/{barber_id}?start={day}', None),
+        (f'/appointments/{appointment_id}', None),
+        (f'/notifications/{barber_id}', auth),
+        (f'/notifications/{barber_id}/unread-count', auth),
+    ]
+
+
+def summarize(latencies, elapsed, errors):
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'threads': threading.active_count(),
+    }
+
+
+def run_sync(app, paths, concurrency, total):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one(i):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        path, headers = paths[i % len(paths)]
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        elapsed = time.perf_counter() - started
+        response.close()
+        with lock:
+            latencies.append(elapsed)
+            if response.status_code >= 400:
+                errors[0] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        threads = threading.active_count()
+        list(executor.map(one, range(total)))
+    result = summarize(latencies, time.perf_counter() - started, errors[0])
+    result['threads'] = max(result['threads'], threads + concurrency)
+    return result
+
+
+async def run_async(app, paths, concurrency, total):
+    client = app.test_client()
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            path, headers = paths[i % len(paths)]
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            await response.get_data()
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+async def run_async_levels(app, paths, levels, total):
+    # One event loop for every level, so the async engine's pool is reused
+    from server.async_db import dispose_async_engine
+
+    results = {}
+    try:
+        await run_async(app, paths, 1, len(paths))  # warm up
+        for concurrency in levels:
+            results[concurrency] = await run_async(app, paths, concurrency, total)
+    finally:
+        await dispose_async_engine()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare the sync and async read paths under concurrency')
+    parser.add_argument('--scale', default='small', choices=list(SCALES))
+    parser.add_argument('--concurrency', default='1,16,64', help='Comma separated client counts')
+    parser.add_argument('--requests', type=int, default=400, help='Requests per concurrency level')
+    parser.add_argument('--allow-drop', action='store_true',
+                        help='Allow seeding to drop every table of a DATABASE_URL that is not SQLite')
+    args = parser.parse_args(argv)
+
+    from sqlalchemy.orm import sessionmaker
+    from server.db import engine
+    from server.auth import issue_token
+    from server.async_app import create_async_app
+    from run import app
+
+    data = seed(args.scale, allow_drop=args.allow_drop)
+    session = sessionmaker(bind=engine)()
+    try:
+        paths = read_paths(data, session, issue_token)
+    finally:
+        session.close()
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    run_sync(app, paths, 1, len(paths))  # warm up
+    sync_results = {concurrency: run_sync(app, paths, concurrency, args.requests) for concurrency in levels}
+    async_results = asyncio.run(run_async_levels(create_async_app(), paths, levels, args.requests))
+
+    print(f'{"clients":>8} {"mode":>6} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"threads":>8} {"errors":>7}')
+    for concurrency in levels:
+        for mode, stats in (('sync', sync_results[concurrency]), ('async', async_results[concurrency])):
+            print(f"{concurrency:>8} {mode:>6} {stats['throughput_rps']:>9} {stats['p50_ms']:>8} {stats['p95_ms']:>8} "
+                  f"{stats['p99_ms']:>8} {stats['threads']:>8} {stats['errors']:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
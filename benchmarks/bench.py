@@ -0,0 +1,335 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# The app reads its configuration at import time, so point it at a local SQLite file
+# (unless DATABASE_URL is set to a local MySQL) and keep side effects cheap before
+# importing anything from the project
+os.environ.setdefault('DATABASE_URL', 'sqlite:///benchmarks/bench.sqlite3')
+os.environ.setdefault('BCRYPT_LOG_ROUNDS', '4')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# Nothing listens on the discard port, so confirmation emails fail fast without retries
+os.environ.setdefault('SMTP_HOST', '127.0.0.1')
+os.environ.setdefault('SMTP_PORT', '9')
+os.environ.setdefault('SMTP_USE_TLS', 'false')
+os.environ.setdefault('EMAIL_MAX_RETRIES', '0')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.seed import SCALES, PASSWORD, seed  # noqa: E402
+
+
+# Drives every route of the app through the Flask test client against a seeded shop
+# and reports throughput and p50/p95/p99 latency per route.
+#
+#   python -m benchmarks.bench --scales small,medium --output results.json
+#   python -m benchmarks.bench --compare baseline.json --output results.json
+#
+# --compare flags every route whose p95 got worse than the baseline by more than
+# --threshold and exits non-zero.
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def http_date(day):
+    return datetime.combine(day, datetime.min.time()).strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+
+def build_routes(data, session, token_for):
+    from sqlalchemy.orm import sessionmaker
+    from server.classes import Schedule, Appointment, Notification, Service, Barber_Service
+
+    barber_id = data['barber_ids'][1] if len(data['barber_ids']) > 1 else data['barber_ids'][0]
+    admin_id = data['barber_ids'][0]
+    service_id = data['service_ids'][0]
+    today = datetime.now().date()
+    day = today.isoformat()
+    barber_auth = {'Authorization': f'Bearer {token_for(barber_id, "barber")}'}
+    admin_auth = {'Authorization': f'Bearer {token_for(admin_id, "admin")}'}
+
+    appointment_id = session.query(Appointment.Appointment_ID).filter_by(Barber_User_ID=barber_id).first()[0]
+    notification_id = session.query(Notification.Notification_ID).filter_by(User_ID=barber_id).first()[0]
+    notification_ids = [row[0] for row in session.query(Notification.Notification_ID).filter_by(User_ID=barber_id).limit(20)]
+    service = session.query(Service).filter_by(Service_ID=service_id).one()
+    service_body = {
+        'Service_ID': service.Service_ID, 'Service_Name': service.Service_Name,
+        'Service_Description': service.Service_Description, 'Service_Price': str(service.Service_Price),
+        'Service_Duration': service.Service_Duration,
+    }
+
+    # Future slots that are still free, consumed one per booking / block request
+    free_slots = iter(
+        session.query(Schedule.Barber_User_ID, Schedule.Slot_Date, Schedule.Start_Time, Schedule.End_Time)
+        .filter(Schedule.Status == 'Available', Schedule.Slot_Date > today)
+        .order_by(Schedule.Slot_Date.desc(), Schedule.Start_Time)
+        .all()
+    )
+
+    # Appointment.Email and Phone_Number are unique, so every booking gets its own. Users
+    # and services are unique by name too
+    booking_numbers = itertools.count(1)
+    user_numbers = itertools.count(1)
+    service_numbers = itertools.count(1)
+
+    def prepare(change):
+        # Puts the data a write route needs in place, outside the timed request
+        prepare_session = sessionmaker(bind=session.get_bind())()
+        try:
+            result = change(prepare_session)
+            prepare_session.commit()
+            return result
+        finally:
+            prepare_session.close()
+
+    def booking():
+        slot_barber, slot_date, start, end = next(free_slots)
+        number = next(booking_numbers)
+        return {
+            'first_name': 'Bench', 'last_name': 'Mark', 'email': f'bench{number}@shop.test',
+            'phone': f'9{number:09d}', 'barber_id': slot_barber,
+            'date': http_date(slot_date), 'start_time': start.strftime('%H:%M'), 'end_time': end.strftime('%H:%M'),
+            'service_id': service_id, 'customer_id': data['customer_ids'][0], 'payment_method': 1,
+        }
+
+    def block():
+        slot_barber, slot_date, start, end = next(free_slots)
+        return (f'/addBlock/{slot_barber}/{slot_date.isoformat()}',
+                [{'start_time': start.strftime('%H:%M'), 'end_time': end.strftime('%H:%M')}])
+
+    def block_range():
+        slot_barber, slot_date, start, end = next(free_slots)
+        return {'barber_ids': [slot_barber], 'dates': [slot_date.isoformat()],
+                'start': start.strftime('%H:%M'), 'end': end.strftime('%H:%M')}
+
+    def blocked_slot():
+        # A free slot blocked directly in the database, for the unblock routes
+        slot_barber, slot_date, start, end = next(free_slots)
+        prepare(lambda s: s.query(Schedule).filter_by(Barber_User_ID=slot_barber, Start_Time=start).update(
+            {'Status': 'Unavailable'}, synchronize_session=False))
+        return slot_barber, slot_date, start, end
+
+    def unblock():
+        slot_barber, slot_date, start, end = blocked_slot()
+        return (f'/removeBlock/{slot_barber}/{slot_date.isoformat()}',
+                [{'start_time': start.strftime('%H:%M'), 'end_time': end.strftime('%H:%M')}])
+
+    def unblock_range():
+        slot_barber, slot_date, start, end = blocked_slot()
+        return {'barber_ids': [slot_barber], 'dates': [slot_date.isoformat()],
+                'start': start.strftime('%H:%M'), 'end': end.strftime('%H:%M')}
+
+    def register():
+        number = next(user_numbers)
+        return {'username': f'bench{number}', 'password': PASSWORD, 'firstName': 'Bench', 'lastName': 'User',
+                'email': f'bench{number}@users.test', 'phoneNumber': f'7{number:09d}'}
+
+    def new_service():
+        number = next(service_numbers)
+        return {'Service_Name': f'Bench {number}', 'Service_Description': f'Benchmark service {number}',
+                'Service_Price': 20, 'Service_Duration': '30 minutes'}
+
+    def service_to_delete():
+        number = next(service_numbers)
+
+        def add(s):
+            doomed = Service(Service_Name=f'Doomed {number}', Service_Description=f'Deleted by the benchmark {number}',
+                             Service_Price=20, Service_Duration='30 minutes')
+            s.add(doomed)
+            s.flush()
+            return doomed.Service_ID
+        return f'/services/{prepare(add)}/{admin_id}'
+
+    def service_to_disable():
+        prepare(lambda s: s.query(Barber_Service).filter_by(Barber_User_ID=admin_id, Service_ID=service_id).update(
+            {'Status': 'Enabled'}, synchronize_session=False))
+        return f'/services/disable/{service_id}/{admin_id}'
+
+    # name -> function returning (method, path, json body, headers)
+    return {
+        'GET /services': lambda: ('GET', '/services', None, None),
+        'GET /services/<user_id>': lambda: ('GET', f'/services/{barber_id}', None, None),
+        'GET /payment-methods': lambda: ('GET', '/payment-methods', None, None),
+        'GET /barber_crud': lambda: ('GET', '/barber_crud', None, None),
+        'GET /service/<id>/availability': lambda: ('GET', f'/service/{service_id}/availability', None, None),
+        'GET /service/<id>/next-available': lambda: (
+            'GET', f'/service/{service_id}/next-available?k=10', None, None),
+        'GET /schedule/<id>/available-dates': lambda: ('GET', f'/schedule/{barber_id}/available-dates', None, None),
+        'GET /schedule/<id>/available-time-slots': lambda: (
+            'GET', f'/schedule/{barber_id}/available-time-slots?date={http_date(today)}', None, None),
+        'GET /availabletimeslots': lambda: ('GET', f'/availabletimeslots/{barber_id}/{day}', None, None),
+        'GET /unavailabletimeslots': lambda: ('GET', f'/unavailabletimeslots/{barber_id}/{day}', None, None),
+        'GET /dailyappointments': lambda: ('GET', f'/dailyappointments/{barber_id}/{day}', None, None),
+        'GET /weeklyappointments': lambda: (
+            'GET', f'/weeklyappointments/{barber_id}?start={day}', None, None),
+        'GET /appointments/<id>': lambda: ('GET', f'/appointments/{appointment_id}', None, None),
+        'GET /notifications/<user_id>': lambda: ('GET', f'/notifications/{barber_id}', None, barber_auth),
+        'GET /notifications/<user_id>/unread-count': lambda: (
+            'GET', f'/notifications/{barber_id}/unread-count', None, barber_auth),
+        'PUT /mark-as-read/<id>': lambda: ('PUT', f'/mark-as-read/{notification_id}', None, None),
+        'PUT /mark-all-as-read': lambda: ('PUT', '/mark-all-as-read', {'notificationIds': notification_ids}, None),
+        'POST /login': lambda: ('POST', '/login', {'username': 'barber0', 'password': PASSWORD}, None),
+        'POST /register': lambda: ('POST', '/register', register(), None),
+        'POST /logout': lambda: (
+            'POST', '/logout', None, {'Authorization': f'Bearer {token_for(barber_id, "barber")}'}),
+        'PUT /update-profile': lambda: ('PUT', '/update-profile', {'username': 'barber0', 'firstName': 'Barber0'}, None),
+        'PUT /barber_crud toggle': lambda: (
+            'PUT', f'/barber_crud/{admin_id}/services/{service_id}', {}, None),
+        'POST /addservice': lambda: ('POST', '/addservice', new_service(), None),
+        'PUT /updateservice/<id>': lambda: ('PUT', f'/updateservice/{service_id}', service_body, None),
+        'PUT /services/disable': lambda: ('PUT', service_to_disable(), None, None),
+        'DELETE /services/<id>/<user_id>': lambda: ('DELETE', service_to_delete(), None, admin_auth),
+        'POST /bookings': lambda: ('POST', '/bookings', booking(), None),
+        'PUT /addBlock': lambda: ('PUT', *block(), None),
+        'PUT /addBlock/range': lambda: ('PUT', '/addBlock/range', block_range(), None),
+        'PUT /removeBlock': lambda: ('PUT', *unblock(), None),
+        'PUT /removeBlock/range': lambda: ('PUT', '/removeBlock/range', unblock_range(), None),
+        'GET /metrics': lambda: ('GET', '/metrics', None, None),
+        'GET /diagnostics/pool': lambda: ('GET', '/diagnostics/pool', None, None),
+        'GET /diagnostics/mail': lambda: ('GET', '/diagnostics/mail', None, None),
+        'POST /admin/schedule/generate': lambda: (
+            'POST', '/admin/schedule/generate',
+            {'start_date': data['start_date'].isoformat(), 'end_date': data['end_date'].isoformat()}, admin_auth),
+    }
+
+
+def run_scale(app, scale, requests_per_route, warmup, only=None, allow_drop=False):
+    from sqlalchemy.orm import sessionmaker
+    from server.db import engine
+    from server.auth import issue_token
+    from server.availability import availability_index
+    from server.cache import reference_cache
+
+    seed_started = time.perf_counter()
+    data = seed(scale, allow_drop=allow_drop)
+    seed_seconds = time.perf_counter() - seed_started
+
+    # Caches from the previous scale would hide the new data
+    availability_index.invalidate()
+    reference_cache.invalidate()
+
+    session = sessionmaker(bind=engine)()
+    try:
+        routes = build_routes(data, session, issue_token)
+    finally:
+        session.close()
+
+    client = app.test_client()
+    results = {}
+    for name, make_request in routes.items():
+        if only and name not in only:
+            continue
+        latencies = []
+        statuses = {}
+        try:
+            for i in range(warmup + requests_per_route):
+                method, path, body, headers = make_request()
+                started = time.perf_counter()
+                response = client.open(path, method=method, json=body, headers=headers)
+                elapsed = time.perf_counter() - started
+                response.close()
+                if i >= warmup:
+                    latencies.append(elapsed)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        except StopIteration:
+            # Ran out of free slots for write routes at this scale
+            pass
+
+        latencies.sort()
+        total = sum(latencies)
+        results[name] = {
+            'requests': len(latencies),
+            'throughput_rps': round(len(latencies) / total, 2) if total else 0.0,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        }
+
+    return {
+        'seed_seconds': round(seed_seconds, 3),
+        'data': {key: data[key] for key in ('schedules', 'appointments', 'notifications')},
+        'routes': results,
+    }
+
+
+def compare(results, baseline, threshold):
+    # Returns a list of (scale, route, baseline p95, current p95) that regressed
+    regressions = []
+    for scale, scale_results in results['scales'].items():
+        baseline_routes = baseline.get('scales', {}).get(scale, {}).get('routes', {})
+        for route, stats in scale_results['routes'].items():
+            before = baseline_routes.get(route)
+            if before and before['p95_ms'] and stats['p95_ms'] > before['p95_ms'] * (1 + threshold):
+                regressions.append((scale, route, before['p95_ms'], stats['p95_ms']))
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark every route against a seeded synthetic shop')
+    parser.add_argument('--scales', default='small', help=f"Comma separated, from {', '.join(SCALES)}")
+    parser.add_argument('--requests', type=int, default=200, help='Measured requests per route')
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per route')
+    parser.add_argument('--routes', help='Comma separated route names to run (default: all)')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='Baseline results JSON to flag regressions against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed p95 slowdown before flagging, 0.2 = 20%%')
+    parser.add_argument('--allow-drop', action='store_true',
+                        help='Allow seeding to drop every table of a DATABASE_URL that is not SQLite')
+    args = parser.parse_args(argv)
+
+    from run import app
+
+    only = set(args.routes.split(',')) if args.routes else None
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'database': os.environ['DATABASE_URL'].split('://', 1)[0],
+            'requests_per_route': args.requests,
+        },
+        'scales': {},
+    }
+    for scale in args.scales.split(','):
+        results['scales'][scale] = run_scale(app, scale, args.requests, args.warmup, only, args.allow_drop)
+        print(f'== {scale} ==')
+        for route, stats in results['scales'][scale]['routes'].items():
+            print(f"{route:45} {stats['throughput_rps']:>9} req/s  p50 {stats['p50_ms']:>8} ms  "
+                  f"p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms  {stats['statuses']}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f'Results written to {args.output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for scale, route, before, after in regressions:
+            print(f'REGRESSION [{scale}] {route}: p95 {before} ms -> {after} ms')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
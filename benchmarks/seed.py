@@ -0,0 +1,145 @@
+import random
+from datetime import date, datetime, timedelta
+import bcrypt
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from server.db import Base, engine
+from server.classes import User, Service, Barber_Service, Schedule, Appointment, Notification, Payment_Type
+from server.schedule_gen import generate_schedule
+
+
+# Synthetic barbershop used by the benchmarks.
+#
+# Everything is generated from a fixed random seed so two runs at the same scale
+# produce the same data. Every user's password is "password", hashed with a low
+# work factor so logins don't dominate the numbers.
+
+SCALES = {
+    'small': {'barbers': 3, 'services': 5, 'customers': 50, 'days': 30, 'booked_fraction': 0.3},
+    'medium': {'barbers': 10, 'services': 15, 'customers': 500, 'days': 90, 'booked_fraction': 0.3},
+    'large': {'barbers': 25, 'services': 30, 'customers': 2000, 'days': 180, 'booked_fraction': 0.3},
+}
+
+PASSWORD = 'password'
+
+
+def seed(scale, random_seed=4375, bind=engine, allow_drop=False):
+    config = SCALES[scale]
+    rng = random.Random(random_seed)
+
+    # Start from an empty schema every time. That wipes the database, so anything but
+    # SQLite needs allow_drop (--allow-drop on the command line)
+    if bind.dialect.name != 'sqlite' and not allow_drop:
+        raise RuntimeError(f'Refusing to drop every table on {bind.url!r}, pass --allow-drop if this database is disposable')
+    Base.metadata.drop_all(bind)
+    Base.metadata.create_all(bind)
+
+    Session = sessionmaker(bind=bind)
+    session = Session()
+    try:
+        password_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(4)).decode('utf-8')
+
+        session.execute(insert(Payment_Type), [
+            {'Payment_Type_Name': 'Cash'},
+            {'Payment_Type_Name': 'Card'},
+        ])
+
+        users = [{
+            'Username': 'admin', 'Password': password_hash, 'F_Name': 'Admin', 'L_Name': 'User',
+            'User_Type': 'admin', 'Email': 'admin@shop.test', 'Phone_Number': '5550000000',
+        }]
+        for i in range(config['barbers']):
+            users.append({
+                'Username': f'barber{i}', 'Password': password_hash, 'F_Name': f'Barber{i}', 'L_Name': 'Cutter',
+                'User_Type': 'barber', 'Email': f'barber{i}@shop.test', 'Phone_Number': f'551{i:07d}',
+            })
+        for i in range(config['customers']):
+            users.append({
+                'Username': f'customer{i}', 'Password': password_hash, 'F_Name': f'Cust{i}', 'L_Name': 'Omer',
+                'User_Type': 'customer', 'Email': f'c{i}@shop.test', 'Phone_Number': f'552{i:07d}',
+            })
+        session.execute(insert(User), users)
+
+        services = []
+        for i in range(config['services']):
+            services.append({
+                'Service_Name': f'Service {i}',
+                'Service_Description': f'Synthetic service number {i}',
+                'Service_Price': 15 + 5 * (i % 6),
+                'Service_Duration': f'{30 * (1 + i % 2)} minutes',
+                # Bulk inserts skip the model's validator, which would fill this in
+                'Service_Duration_Minutes': 30 * (1 + i % 2),
+            })
+        session.execute(insert(Service), services)
+        session.commit()
+
+        barber_ids = [user_id for (user_id,) in session.query(User.User_ID).filter(User.User_Type.in_(['admin', 'barber']))]
+        customer_ids = [user_id for (user_id,) in session.query(User.User_ID).filter(User.User_Type == 'customer')]
+        service_ids = [service_id for (service_id,) in session.query(Service.Service_ID)]
+
+        session.execute(insert(Barber_Service), [
+            {'Barber_User_ID': barber_id, 'Service_ID': service_id,
+             'Status': 'Enabled' if rng.random() < 0.7 else 'Disabled'}
+            for barber_id in barber_ids for service_id in service_ids
+        ])
+        session.commit()
+
+        # Half the window in the past, half in the future, like a shop that's been running a while
+        start_date = date.today() - timedelta(days=config['days'] // 2)
+        end_date = start_date + timedelta(days=config['days'] - 1)
+        generate_schedule(session, start_date, end_date, barber_ids=barber_ids)
+
+        slots = session.query(Schedule.Schedule_ID, Schedule.Barber_User_ID, Schedule.Start_Time, Schedule.End_Time).all()
+        booked = rng.sample(slots, int(len(slots) * config['booked_fraction']))
+
+        appointments = []
+        for i, (schedule_id, barber_id, start, end) in enumerate(booked):
+            appointments.append({
+                'F_Name': 'Walk', 'L_Name': 'In',
+                # Email and Phone_Number are unique on Appointment
+                'Email': f'a{i}@shop.test', 'Phone_Number': f'{i:010d}',
+                'Customer_User_ID': rng.choice(customer_ids),
+                'Barber_User_ID': barber_id,
+                'Appointment_Date_Time': start,
+                'Appointment_End_Date_Time': end,
+                'Status': 'Confirmed',
+                'Payment_Type_ID': rng.choice([1, 2]),
+                'Service_ID': rng.choice(service_ids),
+                'Schedule_ID': schedule_id,
+            })
+        for offset in range(0, len(appointments), 1000):
+            session.execute(insert(Appointment), appointments[offset:offset + 1000])
+
+        booked_ids = [row[0] for row in booked]
+        for offset in range(0, len(booked_ids), 1000):
+            session.query(Schedule).filter(Schedule.Schedule_ID.in_(booked_ids[offset:offset + 1000])).update(
+                {'Status': 'Unavailable'}, synchronize_session=False
+            )
+        session.commit()
+
+        now = datetime.now()
+        notifications = [
+            {
+                'User_ID': barber_id, 'Appointment_ID': appointment_id,
+                'Message': 'Your appointment has been booked.', 'Notification_Type': 'Booking Confirmation',
+                'Notification_Date_Time': now - timedelta(minutes=rng.randint(0, 60 * 24 * config['days'])),
+                'Notification_Status': 'Unread' if rng.random() < 0.2 else 'Read',
+            }
+            for appointment_id, barber_id in session.query(Appointment.Appointment_ID, Appointment.Barber_User_ID)
+        ]
+        for offset in range(0, len(notifications), 1000):
+            session.execute(insert(Notification), notifications[offset:offset + 1000])
+        session.commit()
+
+        return {
+            'barber_ids': barber_ids,
+            'customer_ids': customer_ids,
+            'service_ids': service_ids,
+            'start_date': start_date,
+            'end_date': end_date,
+            'schedules': len(slots),
+            'appointments': len(appointments),
+            'notifications': len(notifications),
+        }
+    finally:
+        session.close()
@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///benchmarks/bench.sqlite3')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify  # noqa: E402
+from server.classes import Appointment, serializer  # noqa: E402
+from server.serialization import dumps, dumps_msgpack, msgpack  # noqa: E402
+
+
+# Microbenchmark of response serialization, without the database: the per-route dict
+# building + jsonify the routes used to do, against the serializer registry + orjson
+# (and MessagePack) they use now, on weekly calendar rows.
+#
+#   python -m benchmarks.serialization --rows 50,500,5000
+
+
+def make_rows(count):
+    start = datetime(2024, 1, 1, 9)
+    rows = []
+    for i in range(count):
+        begins = start + timedelta(minutes=30 * i)
+        rows.append((
+            i, begins, begins + timedelta(minutes=30), 'Confirmed', 1 + i % 2, 1 + i % 5, 2, 10 + i % 50,
+            'Walk', 'In', f'a{i}@shop.test', f'{i:010d}',
+        ))
+    return rows
+
+
+def legacy(rows):
+    # What /weeklyappointments did: a dict per row built field by field, then jsonify
+    appointments_list = []
+    for (appointment_id, start_time, end_time, status, payment_type_id, service_id, barber_user_id,
+         customer_user_id, first_name, last_name, email, phone_number) in rows:
+        appointments_list.append({
+            "Appointment_ID": appointment_id,
+            "Appointment_Date_Time": start_time.strftime('%Y-%m-%d %H:%M:%S'),
+            "Appointment_End_Date_Time": end_time.strftime('%Y-%m-%d %H:%M:%S'),
+            "Status": status,
+            "Payment_ID": payment_type_id,
+            "Service_ID": service_id,
+            "Barber_User_ID": barber_user_id,
+            "Customer_User_ID": customer_user_id,
+            "F_Name": first_name,
+            "L_Name": last_name,
+            "Email": email,
+            "Phone_Number": phone_number,
+        })
+    return jsonify({"appointments": appointments_list}).get_data()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare response serialization paths')
+    parser.add_argument('--rows', default='50,500,5000', help='Comma separated row counts')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    view = serializer(Appointment)
+    app = Flask(__name__)
+    paths = {
+        'dicts + jsonify': legacy,
+        'registry + orjson': lambda rows: dumps({"appointments": view.dump_all(rows)}),
+    }
+    if msgpack is not None:
+        paths['registry + msgpack'] = lambda rows: dumps_msgpack({"appointments": view.dump_all(rows)})
+
+    with app.app_context():
+        for count in (int(count) for count in args.rows.split(',')):
+            rows = make_rows(count)
+            # Same content whichever way it is encoded
+            assert json.loads(legacy(rows)) == json.loads(paths['registry + orjson'](rows))
+            number = max(1, 20000 // count)
+            print(f'== {count} rows ==')
+            baseline = None
+            for name, fn in paths.items():
+                seconds = min(timeit.repeat(lambda: fn(rows), number=number, repeat=args.repeat)) / number
+                baseline = baseline or seconds
+                print(f'{name:22} {seconds * 1000:9.3f} ms  {baseline / seconds:5.1f}x  {len(fn(rows)):>9} bytes')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+# Measures how long a fresh interpreter takes to import the app and build it with
+# create_app(), and its peak resident memory, in a new process per run so the
+# import cache is cold every time.
+#
+#   python -m benchmarks.startup --runs 10
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import json, resource, sys, time
+started = time.perf_counter()
+from server import create_app
+create_app()
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+    'pandas': 'pandas' in sys.modules,
+}))
+'''
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time create_app() in a fresh interpreter')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite:///benchmarks/bench.sqlite3')
+    env.setdefault('SECRET_KEY', 'benchmark')
+    env.setdefault('LOG_LEVEL', 'WARNING')
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.check_output([sys.executable, '-c', PROBE], cwd=ROOT, env=env, text=True)
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    seconds = sorted(run['seconds'] for run in runs)
+    print(f"create_app: median {statistics.median(seconds) * 1000:.1f} ms, "
+          f"min {seconds[0] * 1000:.1f} ms, max {seconds[-1] * 1000:.1f} ms over {len(runs)} runs")
+    print(f"max RSS {max(run['max_rss_kb'] for run in runs) / 1024:.1f} MB, "
+          f"{runs[-1]['modules']} modules loaded, pandas imported: {runs[-1]['pandas']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
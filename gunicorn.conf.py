@@ -0,0 +1,33 @@
+import gc
+import os
+
+
+# gunicorn -c gunicorn.conf.py run:app
+#
+# With GUNICORN_PRELOAD=true the app is imported once in the master and workers are
+# forked from it, so the imported modules are shared copy-on-write instead of being
+# loaded by every worker. gc.freeze() moves everything allocated so far out of the
+# collector's reach; otherwise the first collection in each worker touches (and
+# copies) every page holding those objects.
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:5001')
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
+
+
+def when_ready(server):
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from server.db import engine
+    from server.logging_setup import restart_logging
+
+    # Connections opened by the master must not be shared with the children
+    engine.dispose(close=False)
+    # The log listener thread stayed behind in the master
+    restart_logging()
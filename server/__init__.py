@@ -1,16 +1,35 @@
+import importlib
 from flask import Flask
 from flask_cors import CORS
-import os
-from dotenv import load_dotenv
-load_dotenv()
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get("DATABASE_URL")
 
-# Configure CORS to allow requests from your frontend origin
-CORS(app, resources={r"/api/*": {"origins": "http://localhost:8080"}})
+def create_app(config=None):
+    # Builds the app. Importing the package stays cheap: models, the engine and the
+    # route modules are only imported here, and pandas only when a schedule is generated
+    from server.db import engine
+    from server.logging_setup import configure_logging
+    from server.metrics import init_metrics
+    from server.routes import BLUEPRINTS
+    from server.cli import COMMANDS
 
+    app = Flask(__name__)
+    app.config['CORS_ORIGINS'] = 'http://localhost:8080'
+    if config:
+        app.config.update(config)
 
-from server.classes import User, Schedule, Appointment, Service, Notification, Review, Customer_History, Holiday, Blacklist, Barber_Service
+    # Configure CORS to allow requests from your frontend origin
+    CORS(app, resources={r"/*": {"origins": app.config['CORS_ORIGINS']}}, methods=['GET', 'POST', 'PUT', 'DELETE'])
 
+    # Queue-based logging with per-request correlation ids, see server/logging_setup.py
+    configure_logging(app)
 
+    # Per-route latency and SQL statement metrics, exposed at /metrics
+    init_metrics(app, engine)
+
+    for module_name in BLUEPRINTS:
+        app.register_blueprint(importlib.import_module(module_name).bp)
+
+    for command in COMMANDS:
+        app.cli.add_command(command)
+
+    return app
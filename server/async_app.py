@@ -0,0 +1,317 @@
+import asyncio
+from datetime import datetime
+from quart import Blueprint, Quart, Response, jsonify, request
+from quart_cors import cors
+from sqlalchemy import select
+from server.classes import Schedule
+from server.auth import InvalidToken, verify_stream_token, verify_token
+from server.async_notify import hub as notification_streams
+from server.cache import reference_cache
+from server.http_cache import CACHE_CONTROL, conditional_response
+from server.serialization import encode
+from server.async_db import async_session, dispose_async_engine
+from server.logging_setup import configure_logging
+from server.notify_hub import TooManyStreams, HEARTBEAT_SECONDS, format_event
+from server.routes.services import SERVICE, PAYMENT_METHOD, services_statement
+from server.routes.notifications import (
+    notification_page_args, notification_page_statement, format_notification_page, unread_count_statement,
+    NOTIFICATION, missed_notifications_statement,
+)
+from server.routes.bookings import (
+    appointment_window, weekly_appointments_statement, format_weekly_appointments,
+    appointment_details_statement, format_appointment_details,
+    daily_appointments_statement, format_daily_appointments,
+)
+from server.routes.schedule import format_time_slots, parse_date
+
+
+# Optional async serving mode for the read-heavy routes, on SQLAlchemy's asyncio engine.
+#
+#   hypercorn asgi:app
+#
+# Each route here answers exactly like its sync twin in server/routes/ and shares its
+# query and formatting helpers, but awaits the database instead of holding a thread
+# while it waits. Writes stay on the sync app; run both behind the same proxy and send
+# the GET paths below to this one. Availability is read straight from the
+# (Barber_User_ID, Slot_Date, Status) index rather than the in-memory availability index,
+# which is per process and only kept current by the sync write routes.
+
+bp = Blueprint('async_reads', __name__)
+
+
+def _render(payload, status=200):
+    # render() from server/routes/common.py, for Quart
+    body, mimetype = encode(payload, request.headers.get('Accept'))
+    return Response(body, status=status, mimetype=mimetype, headers={'Vary': 'Accept'})
+
+
+async def _cached(key, load, policy):
+    # Same reference cache, ETags and compression as the sync routes, with the loader
+    # awaited on a miss
+    entry = reference_cache.lookup(key)
+    if entry is None:
+        version = reference_cache.version
+        entry = reference_cache.store(key, await load(), version)
+    body, status, headers = conditional_response(entry, request.headers, CACHE_CONTROL[policy])
+    return Response(body, status=status, headers=headers, mimetype='application/json')
+
+
+def _authorize(user_id):
+    # token_required() for the async routes: returns an error response, or None when
+    # the bearer token belongs to the user (or an admin)
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return jsonify({'message': 'Authentication required'}), 401
+    try:
+        auth = verify_token(header[len('Bearer '):])
+    except InvalidToken as e:
+        return jsonify({'message': str(e)}), 401
+    if auth['uid'] != user_id and auth['role'] != 'admin':
+        return jsonify({'message': 'Forbidden'}), 403
+    return None
+
+
+async def _load_services(user_id=None):
+    async with async_session() as session:
+        return {"services": SERVICE.dump_all(await session.execute(services_statement(user_id)))}
+
+
+async def _load_payment_methods():
+    async with async_session() as session:
+        return {'payment_methods': PAYMENT_METHOD.dump_all(await session.execute(select(*PAYMENT_METHOD.columns)))}
+
+
+@bp.route("/services", methods=["GET"])
+async def get_all_services():
+    try:
+        return await _cached('services', _load_services, 'services')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/services/<int:user_id>", methods=["GET"])
+async def get_services_for_barber(user_id):
+    try:
+        return await _cached(('services', user_id), lambda: _load_services(user_id), 'services')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route('/payment-methods', methods=['GET'])
+async def get_payment_methods():
+    try:
+        return await _cached('payment_methods', _load_payment_methods, 'payment_methods')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/schedule/<int:barber_id>/available-dates', methods=['GET'])
+async def get_available_dates_for_barber(barber_id):
+    try:
+        async with async_session() as session:
+            days = (await session.scalars(
+                select(Schedule.Slot_Date)
+                .where(Schedule.Barber_User_ID == barber_id, Schedule.Status == 'Available')
+                .distinct()
+                .order_by(Schedule.Slot_Date)
+            )).all()
+
+        return _render({'available_dates': days})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+async def _day_slots(barber_id, day, status=None):
+    statement = (
+        select(Schedule.Start_Time, Schedule.End_Time, Schedule.Status)
+        .where(Schedule.Barber_User_ID == barber_id, Schedule.Slot_Date == day)
+        .order_by(Schedule.Start_Time)
+    )
+    if status is not None:
+        statement = statement.where(Schedule.Status == status)
+    async with async_session() as session:
+        return (await session.execute(statement)).all()
+
+
+@bp.route('/schedule/<int:barber_id>/available-time-slots', methods=['GET'])
+async def get_available_time_slots_for_barber(barber_id):
+    try:
+        slot_date = datetime.strptime(request.args.get('date'), '%a, %d %b %Y %H:%M:%S GMT').date()
+
+        time_slots_dict = {}
+        for index, (start_time, end_time, _) in enumerate(await _day_slots(barber_id, slot_date, 'Available'), start=1):
+            time_slots_dict[index] = {
+                'start_time': start_time.strftime('%H:%M'),
+                'end_time': end_time.strftime('%H:%M')
+            }
+
+        return _render({'available_time_slots': time_slots_dict})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/availabletimeslots/<int:user_id>/<string:date>', methods=['GET'])
+async def get_available_time_slots(user_id, date):
+    try:
+        slots = await _day_slots(user_id, parse_date(date), 'Available')
+        return _render({'available_time_slots': format_time_slots(slots)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/unavailabletimeslots/<int:user_id>/<string:date>', methods=['GET'])
+async def get_unavailable_time_slots(user_id, date):
+    try:
+        slots = await _day_slots(user_id, parse_date(date), 'Unavailable')
+        return _render({'unavailable_time_slots': format_time_slots(slots)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/notifications/<int:user_id>', methods=['GET'])
+async def get_notifications(user_id):
+    denied = _authorize(user_id)
+    if denied:
+        return denied
+
+    try:
+        limit, before, unread_only = notification_page_args(request.args)
+    except ValueError:
+        return jsonify({'error': 'Invalid limit or before cursor'}), 400
+
+    try:
+        async with async_session() as session:
+            rows = (await session.execute(notification_page_statement(user_id, limit, before, unread_only))).all()
+        return _render(format_notification_page(rows, limit))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/notifications/<int:user_id>/unread-count', methods=['GET'])
+async def get_unread_notification_count(user_id):
+    denied = _authorize(user_id)
+    if denied:
+        return denied
+
+    try:
+        async with async_session() as session:
+            unread_count = await session.scalar(unread_count_statement(user_id))
+        return _render({'unread_count': unread_count})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/notifications/<int:user_id>/stream', methods=['GET'])
+async def stream_notifications(user_id):
+    # The sync stream (server/routes/notifications.py) without a thread per client:
+    # same ?stream_token=, Last-Event-ID replay, events and heartbeats
+    try:
+        verify_stream_token(request.args.get('stream_token', ''), user_id)
+    except InvalidToken as e:
+        return jsonify({'message': str(e)}), 401
+
+    # Subscribing happens in the generator, whose finally always unsubscribes; a body
+    # that is never read (HEAD) never subscribes. The cap is checked here so the
+    # client still gets a 503 instead of an empty stream
+    if notification_streams.stream_count() >= notification_streams.max_streams:
+        return jsonify({'message': 'Too many open streams, please retry'}), 503, {'Retry-After': '5'}
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+
+    async def generate():
+        try:
+            subscriber = notification_streams.subscribe(user_id)
+        except TooManyStreams:
+            return
+        try:
+            await notification_streams.ready()
+            last_sent = 0
+            if last_event_id and last_event_id.isdigit():
+                last_sent = int(last_event_id)
+                async with async_session() as session:
+                    missed = (await session.execute(missed_notifications_statement(user_id, last_sent))).all()
+                for row in missed:
+                    event = NOTIFICATION.dump(row)
+                    last_sent = event['id']
+                    yield format_event(event)
+
+            yield 'retry: 3000\n\n'
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ': heartbeat\n\n'
+                    continue
+                if event['id'] <= last_sent:
+                    continue
+                last_sent = event['id']
+                yield format_event(event)
+        finally:
+            notification_streams.unsubscribe(user_id, subscriber)
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    # Quart cuts responses off after RESPONSE_TIMEOUT; a stream stays open until the client leaves
+    response.timeout = None
+    return response
+
+
+@bp.route('/weeklyappointments/<int:user_id>', methods=['GET'])
+async def fetchWeeklyAppointments(user_id):
+    try:
+        start, end = appointment_window(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid date range: {e}"}), 400
+
+    try:
+        async with async_session() as session:
+            rows = (await session.execute(weekly_appointments_statement(user_id, start, end))).all()
+        return _render(format_weekly_appointments(rows, start, end))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route('/appointments/<int:appointment_id>', methods=['GET'])
+async def get_appointment_details(appointment_id):
+    try:
+        async with async_session() as session:
+            row = (await session.execute(appointment_details_statement(appointment_id))).first()
+        if row is None:
+            return jsonify({'error': 'Appointment not found'}), 404
+        return _render(format_appointment_details(row))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/dailyappointments/<int:user_id>/<string:date>', methods=['GET'])
+async def get_appointments_for_barber_by_date(user_id, date):
+    try:
+        day_start = datetime.strptime(date, '%Y-%m-%d')
+        async with async_session() as session:
+            rows = (await session.execute(daily_appointments_statement(user_id, day_start))).all()
+        return _render({'appointments': format_daily_appointments(rows)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def create_async_app(config=None):
+    app = Quart(__name__)
+    app.config['CORS_ORIGINS'] = 'http://localhost:8080'
+    if config:
+        app.config.update(config)
+
+    app = cors(app, allow_origin=app.config['CORS_ORIGINS'], allow_methods=['GET'])
+
+    # Same queue-based logger; the request id hooks are Flask specific
+    configure_logging()
+
+    app.register_blueprint(bp)
+
+    @app.after_serving
+    async def _close_engine():
+        await dispose_async_engine()
+
+    return app
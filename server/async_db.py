@@ -0,0 +1,71 @@
+import os
+import ssl
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from server.db import database_url, POOL_SIZE, MAX_OVERFLOW, POOL_TIMEOUT, POOL_RECYCLE, POOL_PRE_PING
+
+
+# asyncio engine for the optional async app (server/async_app.py).
+#
+# Uses the same DATABASE_URL and pool settings as server/db.py, with the driver
+# swapped for an asyncio one: aiomysql for MySQL and aiosqlite for SQLite.
+# ASYNC_DATABASE_URL overrides the derived URL. The engine is created on first use,
+# so importing this module doesn't require the async drivers.
+
+ASYNC_DRIVERS = {
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+_engine = None
+_sessionmaker = None
+
+
+def async_database_url(url=None):
+    override = os.getenv('ASYNC_DATABASE_URL')
+    if override:
+        return override
+    url = make_url(url or database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver configured for {backend} databases, set ASYNC_DATABASE_URL')
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    global _engine
+    if _engine is None:
+        url = async_database_url()
+        engine_kwargs = {}
+        if url.startswith('mysql'):
+            # Same as the sync engine: TLS without certificate verification
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            engine_kwargs['connect_args'] = {'ssl': context}
+        if not url.startswith('sqlite'):
+            engine_kwargs.update(
+                pool_size=POOL_SIZE,
+                max_overflow=MAX_OVERFLOW,
+                pool_timeout=POOL_TIMEOUT,
+                pool_recycle=POOL_RECYCLE,
+                pool_pre_ping=POOL_PRE_PING,
+            )
+        _engine = create_async_engine(url, **engine_kwargs)
+    return _engine
+
+
+def async_session():
+    # async with async_session() as session: ...
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(get_async_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _sessionmaker()
+
+
+async def dispose_async_engine():
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _sessionmaker = None
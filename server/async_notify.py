@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import os
+from sqlalchemy import func, select
+from server.async_db import async_session
+from server.classes import Notification
+from server.notify_hub import TooManyStreams
+from server.routes.notifications import NOTIFICATION
+
+
+# Notification streams for the async app (server/async_app.py).
+#
+# The sync hub (server/notify_hub.py) only hears about notifications created in its
+# own process, and each of its streams holds a gunicorn thread. Here an open stream is
+# just an asyncio.Queue, and one task per process polls the Notification table for
+# rows newer than the last one it saw, handing each to the queues of that user's open
+# streams. Any number of streams costs one primary key range query per poll interval,
+# and notifications created by every sync worker reach them. The task stops when the
+# last stream closes and starts again with the next one.
+
+POLL_SECONDS = float(os.getenv('NOTIFICATION_POLL_SECONDS', '2'))
+MAX_STREAMS = int(os.getenv('ASYNC_NOTIFICATION_MAX_STREAMS', '5000'))
+
+log = logging.getLogger(__name__)
+
+
+class AsyncNotificationHub:
+
+    def __init__(self, max_streams=MAX_STREAMS, poll_seconds=POLL_SECONDS):
+        self.max_streams = max_streams
+        self.poll_seconds = poll_seconds
+        self._subscribers = {}  # user id -> set of asyncio.Queue
+        self._count = 0
+        self._last_id = None
+        self._ready = None
+        self._task = None
+
+    def subscribe(self, user_id, queue_size=100):
+        # Everything runs on the event loop, so no lock is needed
+        if self._count >= self.max_streams:
+            raise TooManyStreams()
+        subscriber = asyncio.Queue(maxsize=queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+        self._count += 1
+        if self._task is None or self._task.done():
+            self._last_id = None
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._poll())
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        subscribers = self._subscribers.get(user_id)
+        if subscribers and subscriber in subscribers:
+            subscribers.discard(subscriber)
+            self._count -= 1
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    async def ready(self):
+        # Resolves once the poller knows where it starts. Notifications after that
+        # point are delivered; a stream replaying Last-Event-ID queries the database
+        # only after this, so nothing falls between the replay and the first poll
+        await self._ready.wait()
+
+    async def _poll(self):
+        try:
+            await self._start_from_latest()
+        except Exception:
+            # Retried below; until then there is nothing to deliver
+            log.exception('Could not read the latest notification id')
+        finally:
+            self._ready.set()
+
+        while self._count:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                if self._last_id is None:
+                    await self._start_from_latest()
+                else:
+                    await self.poll_once()
+            except Exception:
+                log.exception('Notification poll failed')
+
+    async def _start_from_latest(self):
+        async with async_session() as session:
+            self._last_id = await session.scalar(select(func.max(Notification.Notification_ID))) or 0
+
+    async def poll_once(self):
+        async with async_session() as session:
+            rows = (await session.execute(
+                select(Notification.User_ID, *NOTIFICATION.columns)
+                .where(Notification.Notification_ID > self._last_id)
+                .order_by(Notification.Notification_ID)
+            )).all()
+
+        for row in rows:
+            event = NOTIFICATION.dump(row[1:])
+            self._last_id = event['id']
+            for subscriber in list(self._subscribers.get(row[0], ())):
+                try:
+                    subscriber.put_nowait(event)
+                except asyncio.QueueFull:
+                    pass
+
+    def stream_count(self):
+        return self._count
+
+
+hub = AsyncNotificationHub()
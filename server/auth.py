@@ -0,0 +1,126 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# Stateless signed session tokens.
+#
+# /login issues a token carrying the user id and role, signed with SECRET_KEY, so
+# later requests can be authorized without looking the user up again. Tokens expire
+# after TOKEN_MAX_AGE seconds. Logout and role changes go through a small in-memory
+# revocation cache (per token id, or "everything issued before now" per user).
+#
+# The revocation cache lives in each process: with several gunicorn workers a revoked
+# token keeps working in the workers that didn't handle the logout until it expires.
+# Keep TOKEN_MAX_AGE short, or run a single worker, when that matters.
+
+TOKEN_MAX_AGE = int(os.getenv('TOKEN_MAX_AGE', str(60 * 60 * 12)))
+STREAM_TOKEN_MAX_AGE = int(os.getenv('STREAM_TOKEN_MAX_AGE', '60'))
+
+_secret_key = os.getenv('SECRET_KEY')
+if not _secret_key:
+    # Tokens won't survive a restart or validate across workers without a shared key
+    logging.getLogger(__name__).warning('SECRET_KEY is not set, using a random key for this process')
+    _secret_key = os.urandom(32).hex()
+
+_serializer = URLSafeTimedSerializer(_secret_key, salt='auth-token')
+# A different salt, so stream tokens and session tokens can't stand in for each other
+_stream_serializer = URLSafeTimedSerializer(_secret_key, salt='stream-token')
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class RevocationCache:
+
+    def __init__(self, max_age):
+        self.max_age = max_age
+        self._tokens = {}  # token id -> time it can be forgotten
+        self._users = {}  # user id -> tokens issued up to and including this second are revoked
+        self._lock = threading.Lock()
+
+    def revoke_token(self, token_id):
+        with self._lock:
+            self._purge()
+            self._tokens[token_id] = time.time() + self.max_age
+
+    def revoke_user(self, user_id):
+        with self._lock:
+            self._purge()
+            # Token timestamps are whole seconds. Tokens from the current second are revoked
+            # too, since one minted with the old role can't be told apart from a new one
+            self._users[user_id] = int(time.time())
+
+    def is_revoked(self, token_id, user_id, issued_at):
+        revoked_before = self._users.get(user_id)
+        if revoked_before is not None and issued_at <= revoked_before:
+            return True
+        return token_id in self._tokens
+
+    def _purge(self):
+        # Entries only need to live as long as the tokens they revoke
+        now = time.time()
+        self._tokens = {k: v for k, v in self._tokens.items() if v > now}
+        self._users = {k: v for k, v in self._users.items() if v + self.max_age > now}
+
+
+revocations = RevocationCache(TOKEN_MAX_AGE)
+
+
+def issue_token(user_id, role):
+    return _serializer.dumps({'uid': user_id, 'role': role, 'jti': uuid.uuid4().hex})
+
+
+def verify_token(token):
+    try:
+        data, issued_at = _serializer.loads(token, max_age=TOKEN_MAX_AGE, return_timestamp=True)
+    except SignatureExpired:
+        raise InvalidToken('Token expired')
+    except BadSignature:
+        raise InvalidToken('Invalid token')
+
+    if revocations.is_revoked(data.get('jti'), data.get('uid'), issued_at.timestamp()):
+        raise InvalidToken('Token revoked')
+    return data
+
+
+def issue_stream_token(data):
+    # EventSource can't send an Authorization header, so the notification stream takes
+    # its token in the URL, where access logs will record it. Instead of the session
+    # token it gets one that only opens that user's stream and expires in a minute.
+    # data is the verified session token; logging that out revokes this one too
+    return _stream_serializer.dumps({'uid': data['uid'], 'role': data['role'], 'jti': data['jti']})
+
+
+def verify_stream_token(token, user_id):
+    # Returns the token's data if it may open user_id's stream, raises InvalidToken otherwise
+    try:
+        data, issued_at = _stream_serializer.loads(token, max_age=STREAM_TOKEN_MAX_AGE, return_timestamp=True)
+    except SignatureExpired:
+        raise InvalidToken('Stream token expired')
+    except BadSignature:
+        raise InvalidToken('Invalid stream token')
+
+    if revocations.is_revoked(data.get('jti'), data.get('uid'), issued_at.timestamp()):
+        raise InvalidToken('Token revoked')
+    if data['uid'] != user_id and data['role'] != 'admin':
+        raise InvalidToken('Stream token is for another user')
+    return data
+
+
+def revoke_token(data):
+    revocations.revoke_token(data['jti'])
+
+
+def revoke_user(user_id):
+    # Call after changing a user's User_Type so tokens carrying the old role stop working.
+    # No route changes roles yet; a token issued in the same second is revoked as well,
+    # so the user may have to log in again a second later
+    revocations.revoke_user(user_id)
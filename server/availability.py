@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from sqlalchemy.orm import sessionmaker
+from .db import engine
+from .classes import Schedule
+
+
+# In-memory index of each barber's schedule slots, keyed by (barber, date).
+#
+# A day is loaded lazily from the Schedule table the first time it is asked for and
+# kept as a list of slots sorted by start time, so the availability routes become
+# memory reads. create_booking and add_block update slot states in place after they
+# commit. Other worker processes keep their own index, so entries are reloaded after
+# AVAILABILITY_TTL seconds to pick up their writes.
+#
+# Each barber's list of available dates is kept separately, loaded with one DISTINCT
+# query and dropped whenever one of the barber's slots changes. Both are capped: on
+# every load expired entries are dropped, then the least recently used ones beyond
+# max_days / max_barbers, since the keys come straight from request URLs.
+
+Session = sessionmaker(bind=engine)
+
+
+class _Day:
+
+    def __init__(self, rows):
+        # rows are (start, end, status) sorted by start
+        self.starts = [row[0] for row in rows]
+        self.slots = [list(row) for row in rows]
+        self.loaded_at = time.monotonic()
+
+
+class AvailabilityIndex:
+
+    def __init__(self, ttl=60, max_days=2048, max_barbers=256):
+        self.ttl = ttl
+        self.max_days = max_days
+        self.max_barbers = max_barbers
+        self._days = OrderedDict()  # (barber id, date) -> _Day, least recently used first
+        self._dates = OrderedDict()  # barber id -> (loaded_at, sorted dates with an Available slot)
+        self._lock = threading.Lock()
+
+    def _fresh(self, loaded_at):
+        return loaded_at is not None and time.monotonic() - loaded_at < self.ttl
+
+    def _evict(self, entries, limit, loaded_at):
+        # Called with the lock held
+        for key in [key for key, value in entries.items() if not self._fresh(loaded_at(value))]:
+            del entries[key]
+        while len(entries) > limit:
+            entries.popitem(last=False)
+
+    def _load_day(self, barber_id, day):
+        session = Session()
+        try:
+            rows = (
+                session.query(Schedule.Start_Time, Schedule.End_Time, Schedule.Status)
+                .filter(Schedule.Barber_User_ID == barber_id, Schedule.Slot_Date == day)
+                .order_by(Schedule.Start_Time)
+                .all()
+            )
+        finally:
+            session.close()
+        entry = _Day(rows)
+        with self._lock:
+            self._days[(barber_id, day)] = entry
+            self._days.move_to_end((barber_id, day))
+            self._evict(self._days, self.max_days, lambda value: value.loaded_at)
+        return entry
+
+    def _load_dates(self, barber_id):
+        # One query over the (barber, date, status) index, used by available_dates
+        session = Session()
+        try:
+            days = [
+                day for (day,) in
+                session.query(Schedule.Slot_Date)
+                .filter(Schedule.Barber_User_ID == barber_id, Schedule.Status == 'Available')
+                .distinct()
+                .order_by(Schedule.Slot_Date)
+            ]
+        finally:
+            session.close()
+        with self._lock:
+            self._dates[barber_id] = (time.monotonic(), days)
+            self._dates.move_to_end(barber_id)
+            self._evict(self._dates, self.max_barbers, lambda value: value[0])
+        return days
+
+    def _get_day(self, barber_id, day):
+        with self._lock:
+            entry = self._days.get((barber_id, day))
+            if entry is not None and self._fresh(entry.loaded_at):
+                self._days.move_to_end((barber_id, day))
+                return entry
+        return self._load_day(barber_id, day)
+
+    def slots(self, barber_id, day, status=None):
+        # List of (start, end, status) for the day, optionally filtered by status
+        entry = self._get_day(barber_id, day)
+        with self._lock:
+            return [tuple(slot) for slot in entry.slots if status is None or slot[2] == status]
+
+    def available_dates(self, barber_id):
+        with self._lock:
+            cached = self._dates.get(barber_id)
+            if cached is not None and self._fresh(cached[0]):
+                self._dates.move_to_end(barber_id)
+                return list(cached[1])
+        return list(self._load_dates(barber_id))
+
+    def __len__(self):
+        return len(self._days)
+
+    def set_status(self, barber_id, day, start, end, status):
+        # Update a slot in place after the database change has been committed.
+        # Days that aren't loaded are left alone, they'll be read fresh when needed
+        with self._lock:
+            # The day may have gained or lost its last Available slot
+            self._dates.pop(barber_id, None)
+            entry = self._days.get((barber_id, day))
+            if entry is None:
+                return
+            index = bisect_left(entry.starts, start)
+            while index < len(entry.starts) and entry.starts[index] == start:
+                if entry.slots[index][1] == end:
+                    entry.slots[index][2] = status
+                index += 1
+
+    def invalidate(self, barber_id=None):
+        with self._lock:
+            if barber_id is None:
+                self._days.clear()
+                self._dates.clear()
+                return
+            for key in [key for key in self._days if key[0] == barber_id]:
+                del self._days[key]
+            self._dates.pop(barber_id, None)
+
+
+availability_index = AvailabilityIndex(
+    ttl=int(os.getenv('AVAILABILITY_TTL', '60')),
+    max_days=int(os.getenv('AVAILABILITY_MAX_DAYS', '2048')),
+    max_barbers=int(os.getenv('AVAILABILITY_MAX_BARBERS', '256')),
+)
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from server.serialization import dumps
+
+
+# In-process cache for reference data (services, payment types).
+#
+# Payloads are stored already serialized to JSON so a cache hit never touches the
+# Session, the connection pool or the JSON encoder. Every write endpoint calls
+# invalidate(), which bumps a version counter; entries stored under an older version
+# are treated as misses. The TTL bounds how stale other worker processes (which have
+# their own copy of the cache) can get after a write.
+#
+# Keys include request parameters (a barber id, a set of barber ids), so the number of
+# entries is capped: each store() drops expired and stale entries, then the least
+# recently used ones beyond max_entries.
+#
+# Each payload carries a strong ETag hashed from its bytes, so every worker hands out
+# the same ETag for the same data, and keeps any compressed copies made of it.
+
+
+class CachedPayload:
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.etag = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        self.encoded = {}  # content coding -> compressed payload, filled by server.http_cache
+
+
+class ReferenceCache:
+
+    def __init__(self, ttl=300, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._version = 0
+        self._entries = OrderedDict()  # key -> (version, expires_at, payload), least recently used first
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self._version
+
+    def get(self, key, loader):
+        payload = self.lookup(key)
+        if payload is not None:
+            return payload
+
+        # Remember the version we loaded under, so a write that lands while we are
+        # loading makes this entry stale straight away
+        version = self._version
+        return self.store(key, loader(), version)
+
+    def lookup(self, key):
+        # CachedPayload, or None on a miss. With store(), lets async callers await
+        # their loader instead of passing it to get()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            version, expires_at, payload = entry
+            if version == self._version and time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                return payload
+            del self._entries[key]
+        return None
+
+    def store(self, key, value, version):
+        payload = CachedPayload(dumps(value))
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (version, now + self.ttl, payload)
+            self._entries.move_to_end(key)
+            for stale_key in [k for k, (v, expires_at, _) in self._entries.items() if v != self._version or expires_at <= now]:
+                del self._entries[stale_key]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+reference_cache = ReferenceCache(
+    ttl=int(os.getenv('REFERENCE_CACHE_TTL', '300')),
+    max_entries=int(os.getenv('REFERENCE_CACHE_MAX_ENTRIES', '256')),
+)
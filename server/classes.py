@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Numeric, Float
-from sqlalchemy.orm import relationship
+import re
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Boolean, Numeric, Float, Index
+from sqlalchemy.orm import relationship, validates
 from .db import Base, engine
 from datetime import datetime
 
@@ -30,11 +31,20 @@ class Schedule(Base):
 
     Schedule_ID = Column(Integer, primary_key=True, autoincrement=True)
     Barber_User_ID = Column(Integer, ForeignKey('User.User_ID'), nullable=False)
+    # Legacy 'YYYY-MM-DD' string key, still written for older clients. Queries use Slot_Date
     Day_Of_Week = Column(String(9), nullable=False)
+    Slot_Date = Column(Date, nullable=False)
     Start_Time = Column(DateTime, nullable=False)
     End_Time = Column(DateTime, nullable=False)
     Status = Column(String(12), default='Available', nullable=False)
 
+    __table_args__ = (
+        # Slot lookups by barber, day and status
+        Index('ix_schedule_barber_date_status', 'Barber_User_ID', 'Slot_Date', 'Status'),
+        # Range scans by barber and start time (schedule generation, blocking by window)
+        Index('ix_schedule_barber_start', 'Barber_User_ID', 'Start_Time'),
+    )
+
 
 class Appointment(Base):
     __tablename__ = 'Appointment'
@@ -59,6 +69,11 @@ class Appointment(Base):
     appointment_schedule = relationship('Schedule', backref='appointment')
     payment_type = relationship('Payment_Type', backref='appointment')
 
+    __table_args__ = (
+        # A barber's appointments over a date range
+        Index('ix_appointment_barber_start', 'Barber_User_ID', 'Appointment_Date_Time'),
+    )
+
 
 
 class Service(Base):
@@ -69,7 +84,36 @@ class Service(Base):
     Service_Description = Column(String(200), unique=True, nullable=False)
     Service_Price = Column(Numeric(precision=10, scale=2), nullable=False)
     Service_Duration = Column(String(15), nullable=False)
-    
+    # Service_Duration parsed to minutes, kept in step by the validator below
+    Service_Duration_Minutes = Column(Integer, nullable=True)
+
+    @validates('Service_Duration')
+    def _parse_duration(self, key, value):
+        self.Service_Duration_Minutes = parse_duration_minutes(value)
+        return value
+
+
+_DURATION_UNITS = {
+    '': 1, 'm': 1, 'min': 1, 'mins': 1, 'minute': 1, 'minutes': 1,
+    'h': 60, 'hr': 60, 'hrs': 60, 'hour': 60, 'hours': 60,
+}
+
+
+def parse_duration_minutes(text):
+    # "30 minutes", "1 hour", "1h 30m", "1.5 hours", "1:30" or "45" -> minutes,
+    # None when the text can't be read as a duration
+    if text is None:
+        return None
+    text = str(text).strip().lower()
+    clock = re.fullmatch(r'(\d+):(\d{2})', text)
+    if clock:
+        return int(clock.group(1)) * 60 + int(clock.group(2)) or None
+
+    parts = re.findall(r'(\d+(?:\.\d+)?)\s*([a-z]*)', text)
+    if not parts or any(unit not in _DURATION_UNITS for _, unit in parts):
+        return None
+    return int(round(sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts))) or None
+
 
 class Notification(Base):
     __tablename__ = 'Notification'
@@ -82,6 +126,13 @@ class Notification(Base):
     Notification_Date_Time = Column(DateTime, nullable=False)
     Notification_Status = Column(String(15), nullable=False)
 
+    __table_args__ = (
+        # Backs the unread badge count
+        Index('ix_notification_user_status', 'User_ID', 'Notification_Status'),
+        # Keyset pagination, newest first
+        Index('ix_notification_user_date', 'User_ID', 'Notification_Date_Time', 'Notification_ID'),
+    )
+
 
 class Payment_Type(Base):
     __tablename__ = 'Payment_Type'
@@ -140,6 +191,97 @@ class Barber_Service(Base):
     barber = relationship('User', backref='barber_services')
     service = relationship('Service', backref='barber_services')
 
+    __table_args__ = (
+        # The barbers offering a service
+        Index('ix_barber_service_service_status', 'Service_ID', 'Status'),
+    )
+
+
+# Serializers
+#
+# Each model registers named views of its columns for JSON responses. A view lists the
+# response keys and the attributes behind them, so a route selects exactly those
+# columns (select(*view.columns)) and turns each result row into a dict with
+# view.dump(row). Values are left as they come from the database; datetimes and
+# Decimal prices are converted by the encoder in server/serialization.py.
+
+class Serializer:
+
+    def __init__(self, model, fields):
+        # fields are attribute names, or (response key, attribute name) pairs
+        fields = [(field, field) if isinstance(field, str) else field for field in fields]
+        self.keys = tuple(key for key, _ in fields)
+        self.attributes = tuple(attribute for _, attribute in fields)
+        self.columns = self.columns_of(model)
+
+    def columns_of(self, entity):
+        # The same columns from an aliased() entity
+        return tuple(getattr(entity, attribute) for attribute in self.attributes)
+
+    def dump(self, row):
+        return dict(zip(self.keys, row))
+
+    def dump_all(self, rows):
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+
+SERIALIZERS = {}
+
+
+def register_serializer(model, view, fields):
+    SERIALIZERS.setdefault(model, {})[view] = Serializer(model, fields)
+
+
+def serializer(model, view='default'):
+    return SERIALIZERS[model][view]
+
+
+register_serializer(Service, 'default', (
+    'Service_ID', 'Service_Name', 'Service_Description', 'Service_Price', 'Service_Duration',
+))
+register_serializer(Service, 'appointment', (
+    ('service_id', 'Service_ID'),
+    ('service_name', 'Service_Name'),
+    ('service_description', 'Service_Description'),
+    ('service_price', 'Service_Price'),
+    ('service_duration', 'Service_Duration'),
+))
+register_serializer(User, 'account', (
+    'User_ID', 'F_Name', 'L_Name', 'Email', 'Phone_Number',
+))
+register_serializer(Payment_Type, 'default', (
+    ('id', 'Payment_Type_ID'),
+    ('name', 'Payment_Type_Name'),
+))
+register_serializer(Appointment, 'default', (
+    'Appointment_ID', 'Appointment_Date_Time', 'Appointment_End_Date_Time', 'Status',
+    # Appointment has no Payment_ID column, the payment is recorded as its type
+    ('Payment_ID', 'Payment_Type_ID'),
+    'Service_ID', 'Barber_User_ID', 'Customer_User_ID', 'F_Name', 'L_Name', 'Email', 'Phone_Number',
+))
+register_serializer(Appointment, 'daily', (
+    ('id', 'Appointment_ID'),
+    ('appointment_date_time', 'Appointment_Date_Time'),
+    ('appointment_end_date_time', 'Appointment_End_Date_Time'),
+    ('status', 'Status'),
+))
+# Contact details typed in with the booking, and the same keys from the customer's account
+register_serializer(Appointment, 'contact', (
+    ('email', 'Email'), ('first_name', 'F_Name'), ('last_name', 'L_Name'), ('phone_number', 'Phone_Number'),
+))
+register_serializer(User, 'contact', (
+    ('email', 'Email'), ('first_name', 'F_Name'), ('last_name', 'L_Name'), ('phone_number', 'Phone_Number'),
+))
+register_serializer(Notification, 'default', (
+    ('id', 'Notification_ID'),
+    ('appointment_id', 'Appointment_ID'),
+    ('title', 'Notification_Type'),
+    ('content', 'Message'),
+    ('created_at', 'Notification_Date_Time'),
+    ('status', 'Notification_Status'),
+))
+
 
 # # create a function that pulls from the user table
 # def get_user(username):
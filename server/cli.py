@@ -0,0 +1,63 @@
+import click
+from server.routes.common import Session
+
+
+# Maintenance commands, registered on app.cli by server.create_app()
+#
+#   flask --app run migrate
+
+
+@click.command('generate-schedule')
+@click.option('--start', 'start_date', required=True, help='First day, YYYY-MM-DD')
+@click.option('--end', 'end_date', required=True, help='Last day (inclusive), YYYY-MM-DD')
+@click.option('--barber', 'barber_ids', type=int, multiple=True, help='Barber user id, repeatable (default: all barbers)')
+@click.option('--slot-minutes', default=30, show_default=True)
+@click.option('--day-start', default='09:00', show_default=True)
+@click.option('--day-end', default='17:00', show_default=True)
+@click.option('--weekday', 'weekdays', type=int, multiple=True, help='Day of week to include, Monday=0 (default: every day)')
+def generate_schedule_command(start_date, end_date, barber_ids, slot_minutes, day_start, day_end, weekdays):
+    # flask --app run generate-schedule --start 2023-11-01 --end 2023-11-30
+    from server.schedule_gen import generate_schedule
+
+    session = Session()
+    try:
+        result = generate_schedule(
+            session, start_date, end_date,
+            barber_ids=list(barber_ids) or None,
+            slot_minutes=slot_minutes,
+            day_start=day_start,
+            day_end=day_end,
+            weekdays=list(weekdays) or None,
+        )
+        click.echo(f"Created {result['created']} slots, skipped {result['skipped']} existing")
+    finally:
+        session.close()
+
+
+@click.command('migrate')
+def migrate_command():
+    # Bring an existing database up to date with the models (safe to re-run)
+    from server.migrations import run_migrations
+
+    result = run_migrations()
+    click.echo(f"Schedule slot dates backfilled: {result['schedule_slot_dates_backfilled']}")
+    click.echo(f"Service durations backfilled: {result['service_durations_backfilled']}")
+    click.echo(f"Indexes created: {', '.join(result['indexes_created']) or 'none'}")
+
+
+@click.command('explain-hot-queries')
+def explain_hot_queries_command():
+    # Show the query plan of each hot query and whether it uses an index
+    from server.migrations import explain_hot_queries
+
+    all_indexed = True
+    for name, (plan, uses_index) in explain_hot_queries().items():
+        all_indexed = all_indexed and uses_index
+        click.echo(f"{name}: {'uses index' if uses_index else 'NO INDEX'}")
+        for row in plan:
+            click.echo(f"    {row}")
+    if not all_indexed:
+        raise SystemExit(1)
+
+
+COMMANDS = (generate_schedule_command, migrate_command, explain_hot_queries_command)
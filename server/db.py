@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import QueuePool
 import os
+import threading
+import time
 from dotenv import load_dotenv
 # import pymysql
 
@@ -18,6 +21,135 @@ if database_url is None:
 # if database_url.startswith('mysql'):
 #     database_url = database_url.replace('mysql', 'mysql+pymysql', 1)
 
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+# Pool settings, sized per gunicorn worker. Each worker can hold up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections, so keep
+# workers * (size + overflow) below the database's connection limit.
+# DB_POOL_RECYCLE should be shorter than MySQL's wait_timeout.
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', True)
+
+
+class PoolStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+
+    def record_wait(self, elapsed, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+                return
+            self.checkouts += 1
+            self.checkout_wait_total += elapsed
+            self.checkout_wait_max = max(self.checkout_wait_max, elapsed)
+
+    def increment(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'overflow_checkouts': self.overflow_checkouts,
+                'checkout_timeouts': self.checkout_timeouts,
+                'checkout_wait_avg_ms': round(self.checkout_wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'checkout_wait_max_ms': round(self.checkout_wait_max * 1000, 3),
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'soft_invalidations': self.soft_invalidations,
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    # QueuePool that records how long each checkout waited for a connection
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_stats.record_wait(0, timed_out=True)
+            raise
+        pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+engine_kwargs = {}
+if database_url.startswith('mysql'):
+    engine_kwargs['connect_args'] = {'ssl': {'ssl_cert': None}}
+if not database_url.startswith('sqlite'):
+    engine_kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=POOL_PRE_PING,
+    )
+
 # Create the engine using the database URL
-engine = create_engine(database_url, connect_args={'ssl': {'ssl_cert': None}})
-Base = declarative_base()
\ No newline at end of file
+engine = create_engine(database_url, **engine_kwargs)
+Base = declarative_base()
+
+
+@event.listens_for(engine, 'connect')
+def _on_connect(dbapi_connection, connection_record):
+    pool_stats.increment('connects')
+
+
+@event.listens_for(engine, 'checkout')
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool = engine.pool
+    if hasattr(pool, 'overflow') and pool.overflow() > 0:
+        pool_stats.increment('overflow_checkouts')
+
+
+@event.listens_for(engine, 'invalidate')
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    pool_stats.increment('invalidations')
+
+
+@event.listens_for(engine, 'soft_invalidate')
+def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+    pool_stats.increment('soft_invalidations')
+
+
+def pool_status():
+    pool = engine.pool
+    status = {
+        'pid': os.getpid(),
+        'pool_class': type(pool).__name__,
+        'stats': pool_stats.as_dict(),
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=MAX_OVERFLOW,
+            timeout=POOL_TIMEOUT,
+            recycle=POOL_RECYCLE,
+            pre_ping=POOL_PRE_PING,
+        )
+    return status
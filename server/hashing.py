@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# bcrypt is deliberately slow, so hashing and checking passwords runs in a separate
+# process pool instead of on the Flask worker thread. The number of jobs waiting on
+# the pool is bounded; once it is full callers get HashingBusy straight away and the
+# route answers 503 with Retry-After instead of queueing more work. A job that times out
+# gets the same answer. If a pool process dies the pool is replaced on the next call.
+
+BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', '12'))
+HASHING_WORKERS = int(os.getenv('HASHING_WORKERS', str(max(1, (os.cpu_count() or 2) // 2))))
+HASHING_MAX_PENDING = int(os.getenv('HASHING_MAX_PENDING', str(HASHING_WORKERS * 8)))
+HASHING_TIMEOUT = float(os.getenv('HASHING_TIMEOUT', '10'))
+HASHING_RETRY_AFTER = int(os.getenv('HASHING_RETRY_AFTER', '1'))
+
+
+class HashingBusy(Exception):
+    # Raised when the hashing queue is saturated
+    retry_after = HASHING_RETRY_AFTER
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(HASHING_MAX_PENDING)
+
+
+def _mp_context():
+    # The web worker runs several threads (log listener, email dispatcher, requests), and
+    # forking it could copy a lock held by one of them into the pool processes. Start
+    # them from a fork server instead, or spawn them where that isn't available
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _get_executor():
+    # Created lazily so the pool is started after gunicorn forks its workers
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=HASHING_WORKERS, mp_context=_mp_context())
+        return _executor
+
+
+def _discard_executor(executor):
+    # A broken pool refuses all new work, so drop it and let the next call start a new one
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def _submit(fn, *args):
+    # Returns (future, executor), retrying once on a fresh pool if the current one broke
+    for attempt in range(2):
+        executor = _get_executor()
+        try:
+            return executor.submit(fn, *args), executor
+        except BrokenProcessPool:
+            _discard_executor(executor)
+            if attempt:
+                raise
+
+
+def _run(fn, *args):
+    if not _pending.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        future, executor = _submit(fn, *args)
+    except Exception:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    try:
+        return future.result(timeout=HASHING_TIMEOUT)
+    except FutureTimeout:
+        # Still queued behind other jobs, same as a full queue for the client
+        raise HashingBusy()
+    except BrokenProcessPool:
+        # The process running this job died. The client can retry on a fresh pool
+        _discard_executor(executor)
+        raise HashingBusy()
+
+
+# These run inside the pool processes, so they have to be plain module level functions
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(pw_hash, password):
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), pw_hash.encode('utf-8'))
+    except ValueError:
+        # Not a valid bcrypt hash
+        return False
+
+
+def hash_password(password):
+    return _run(_hash, password, BCRYPT_LOG_ROUNDS)
+
+
+def check_password(pw_hash, password):
+    if not pw_hash or password is None:
+        return False
+    return _run(_check, pw_hash, password)
+
+
+def needs_rehash(pw_hash):
+    # Hashes look like $2b$12$..., the second field is the work factor
+    try:
+        return int(pw_hash.split('$')[2]) < BCRYPT_LOG_ROUNDS
+    except (AttributeError, IndexError, ValueError):
+        return False
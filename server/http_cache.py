@@ -0,0 +1,104 @@
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+
+# HTTP conditional requests and compression for payloads from the reference cache.
+#
+# Responses carry the payload's strong ETag, so a client (or proxy) that sends it back
+# in If-None-Match gets a 304 straight from the cache without touching the database.
+# Payloads of at least COMPRESS_MIN_SIZE bytes are sent brotli or gzip compressed,
+# whichever the client accepts; each compressed copy is made once per payload and
+# kept next to it in the cache. Cache-Control is set per route and can be overridden
+# with CACHE_CONTROL_<ROUTE> environment variables.
+
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '9'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '9'))
+
+CACHE_CONTROL = {
+    'services': os.getenv('CACHE_CONTROL_SERVICES', 'public, max-age=60'),
+    'payment_methods': os.getenv('CACHE_CONTROL_PAYMENT_METHODS', 'public, max-age=3600'),
+    'barber_crud': os.getenv('CACHE_CONTROL_BARBER_CRUD', 'private, no-cache'),
+}
+
+# Preferred first
+_ENCODERS = {}
+if brotli is not None:
+    _ENCODERS['br'] = lambda payload: brotli.compress(payload, quality=BROTLI_QUALITY)
+_ENCODERS['gzip'] = lambda payload: gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _accepted_encodings(accept_encoding):
+    # {'gzip': 1.0, 'br': 0.5, ...} from an Accept-Encoding header
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding):
+    accepted = _accepted_encodings(accept_encoding or '')
+    for coding in _ENCODERS:
+        if accepted.get(coding, accepted.get('*', 0.0)) > 0:
+            return coding
+    return None
+
+
+def _etag_matches(if_none_match, etag):
+    # The compressed variants use "<etag>-<coding>", they all stand for the same data
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        if candidate.split('-', 1)[0] == etag:
+            return True
+    return False
+
+
+def _encoded(entry, coding):
+    body = entry.encoded.get(coding)
+    if body is None:
+        # Two threads may both compress on a cold entry, the result is the same
+        body = entry.encoded[coding] = _ENCODERS[coding](entry.payload)
+    return body
+
+
+def conditional_response(entry, headers, cache_control):
+    # Returns (body, status, response headers) for a CachedPayload and the request headers
+    coding = None
+    if len(entry.payload) >= COMPRESS_MIN_SIZE:
+        coding = choose_encoding(headers.get('Accept-Encoding'))
+
+    response_headers = {
+        'ETag': f'"{entry.etag}-{coding}"' if coding else f'"{entry.etag}"',
+        'Cache-Control': cache_control,
+        'Vary': 'Accept-Encoding',
+    }
+    if _etag_matches(headers.get('If-None-Match'), entry.etag):
+        return b'', 304, response_headers
+
+    if coding:
+        response_headers['Content-Encoding'] = coding
+        return _encoded(entry, coding), 200, response_headers
+    return entry.payload, 200, response_headers
@@ -0,0 +1,101 @@
+import atexit
+import logging
+import os
+import queue
+import random
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+
+
+# Logging for the app.
+#
+# Request threads only put log records on an in-memory queue; a QueueListener thread
+# formats them and does the I/O. Every record carries the request's correlation id
+# (taken from X-Request-ID or generated), which is also echoed back in the response.
+# Debug payload dumps go through debug_payload(), which is skipped entirely unless
+# DEBUG is enabled and then only logs a sample of calls.
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '0.01'))
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'
+
+logger = logging.getLogger('server')
+
+_listener = None
+
+
+class _RequestIdFilter(logging.Filter):
+    # Runs on the request thread, where the request context is available
+
+    def filter(self, record):
+        record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # The stock QueueHandler formats the message before queueing it, which would put
+    # the formatting cost back on the request thread. Records stay in this process,
+    # so they can be queued as they are and formatted by the listener
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging(app=None):
+    if _listener is None:
+        _start_listener()
+
+    if app is not None:
+        @app.before_request
+        def _assign_request_id():
+            g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+
+        @app.after_request
+        def _echo_request_id(response):
+            response.headers['X-Request-ID'] = g.get('request_id', '')
+            return response
+
+    return logger
+
+
+def _start_listener():
+    global _listener
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(_RequestIdFilter())
+
+    logger.setLevel(LOG_LEVEL)
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def restart_logging():
+    # Threads don't survive fork(), so a worker forked from a preloaded master has a
+    # stopped listener and a queue nobody drains. Call this in the child after fork
+    global _listener
+    if _listener is not None:
+        logger.handlers = [h for h in logger.handlers if not isinstance(h, _DeferredQueueHandler)]
+        _listener = None
+    _start_listener()
+
+
+def debug_payload(log, message, payload_fn):
+    # payload_fn is only called (and the payload only formatted) for sampled records
+    if log.isEnabledFor(logging.DEBUG) and random.random() < LOG_DEBUG_SAMPLE_RATE:
+        log.debug('%s: %r', message, payload_fn())
@@ -0,0 +1,211 @@
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+import atexit
+from dotenv import load_dotenv
+
+load_dotenv()
+
+log = logging.getLogger(__name__)
+
+
+# Background email dispatcher.
+#
+# Routes hand a finished message to submit() and return right away. A small pool
+# of worker threads drains a bounded queue, each worker keeping its own
+# authenticated SMTP connection open between messages so we only pay for
+# connect/starttls/login once per worker instead of once per email.
+
+
+class EmailDispatcher:
+
+    def __init__(self, host, port, username=None, password=None, use_tls=True,
+                 workers=2, queue_size=100, max_retries=3, backoff=1.0,
+                 timeout=10, idle_timeout=60, smtp_factory=smtplib.SMTP):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        # smtp_factory lets tests point the dispatcher at a local stub server
+        self.smtp_factory = smtp_factory
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._started = False
+
+        # Metrics
+        self._sent = 0
+        self._failed = 0
+        self._dropped = 0
+        self._retries = 0
+        self._connections_opened = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f'email-dispatcher-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._started = True
+
+    def stop(self, timeout=5):
+        with self._lock:
+            if not self._started:
+                return
+            threads = self._threads
+            self._threads = []
+            self._started = False
+        # Sentinels go in outside the lock: workers take it to record metrics before
+        # they get the next item, so blocking on a full queue while holding it deadlocks
+        deadline = time.monotonic() + timeout
+        for _ in threads:
+            try:
+                # One sentinel per worker so each one exits after draining the queue
+                self._queue.put(None, timeout=max(0, deadline - time.monotonic()))
+            except queue.Full:
+                # Still full after the timeout (e.g. the SMTP server is down). The workers
+                # are daemon threads, so whatever is left is lost when the process exits
+                log.warning('Email dispatcher stopped with %d emails still queued', self._queue.qsize())
+                break
+        for thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+
+    def submit(self, sender, recipient, message):
+        # Never block the request thread: if the queue is full the email is dropped
+        self.start()
+        try:
+            self._queue.put_nowait((sender, recipient, message))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+
+    def join(self):
+        # Wait until every queued email has been handled (used by tests/shutdown)
+        self._queue.join()
+
+    def stats(self):
+        with self._lock:
+            attempted = self._sent + self._failed
+            return {
+                'queue_depth': self._queue.qsize(),
+                'queue_capacity': self._queue.maxsize,
+                'workers': len(self._threads),
+                'sent': self._sent,
+                'failed': self._failed,
+                'dropped': self._dropped,
+                'retries': self._retries,
+                'connections_opened': self._connections_opened,
+                'send_latency_last_ms': round(self._latency_last * 1000, 2),
+                'send_latency_avg_ms': round(self._latency_total / attempted * 1000, 2) if attempted else 0.0,
+                'send_latency_max_ms': round(self._latency_max * 1000, 2),
+            }
+
+    def _connect(self):
+        smtp = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            smtp.starttls()
+        if self.username and self.password:
+            smtp.login(self.username, self.password)
+        with self._lock:
+            self._connections_opened += 1
+        return smtp
+
+    @staticmethod
+    def _close(smtp):
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+    def _worker(self):
+        smtp = None
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                # Don't hold an idle connection open forever, the server will drop it anyway
+                self._close(smtp)
+                smtp = None
+                continue
+
+            if item is None:
+                self._queue.task_done()
+                self._close(smtp)
+                return
+
+            sender, recipient, message = item
+            started = time.perf_counter()
+            sent = False
+            for attempt in range(self.max_retries + 1):
+                try:
+                    if smtp is None:
+                        smtp = self._connect()
+                    smtp.sendmail(sender, recipient, message)
+                    sent = True
+                    break
+                except Exception as e:
+                    log.warning('Email send to %s failed (attempt %d): %s', recipient, attempt + 1, e)
+                    # The connection may be in a bad state, reconnect on the next attempt
+                    self._close(smtp)
+                    smtp = None
+                    if attempt < self.max_retries:
+                        with self._lock:
+                            self._retries += 1
+                        time.sleep(self.backoff * (2 ** attempt))
+
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                if sent:
+                    self._sent += 1
+                else:
+                    self._failed += 1
+                self._latency_last = elapsed
+                self._latency_total += elapsed
+                self._latency_max = max(self._latency_max, elapsed)
+            self._queue.task_done()
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    # Created lazily so worker threads are started after gunicorn forks, not before
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = EmailDispatcher(
+                host=os.getenv('SMTP_HOST', 'smtp-mail.outlook.com'),
+                port=int(os.getenv('SMTP_PORT', '587')),
+                username=os.getenv('EMAIL_ADDRESS'),
+                password=os.getenv('EMAIL_PASSWORD'),
+                use_tls=os.getenv('SMTP_USE_TLS', 'true').lower() == 'true',
+                workers=int(os.getenv('EMAIL_WORKERS', '2')),
+                queue_size=int(os.getenv('EMAIL_QUEUE_SIZE', '100')),
+                max_retries=int(os.getenv('EMAIL_MAX_RETRIES', '3')),
+                backoff=float(os.getenv('EMAIL_RETRY_BACKOFF', '1.0')),
+            )
+            atexit.register(_dispatcher.stop)
+        return _dispatcher
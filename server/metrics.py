@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+
+# Per-route request metrics in Prometheus text format.
+#
+# Request hooks time every request into a latency histogram labelled by route,
+# method and status. SQLAlchemy cursor events on the engine count the statements
+# and database time spent by each request. Everything is exposed at /metrics, and
+# with METRICS_RESPONSE_HEADERS=true each response also carries X-DB-Queries and
+# Server-Timing headers.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RESPONSE_HEADERS = os.getenv('METRICS_RESPONSE_HEADERS', 'false').lower() in ('1', 'true', 'yes')
+
+
+class _Histogram:
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        index = bisect_left(LATENCY_BUCKETS, value)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}  # (route, method, status) -> _Histogram
+        self._db_queries = {}  # (route, method) -> statement count
+        self._db_seconds = {}  # (route, method) -> seconds spent in the database
+
+    def observe(self, route, method, status, seconds, db_queries, db_seconds):
+        with self._lock:
+            histogram = self._latency.get((route, method, status))
+            if histogram is None:
+                histogram = self._latency[(route, method, status)] = _Histogram()
+            histogram.observe(seconds)
+            key = (route, method)
+            self._db_queries[key] = self._db_queries.get(key, 0) + db_queries
+            self._db_seconds[key] = self._db_seconds.get(key, 0.0) + db_seconds
+
+    def render(self):
+        lines = [
+            '# HELP http_request_duration_seconds Request latency by route, method and status.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        with self._lock:
+            for (route, method, status), histogram in sorted(self._latency.items()):
+                labels = f'route="{route}",method="{method}",status="{status}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, histogram.buckets):
+                    cumulative += count
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'http_request_duration_seconds_sum{{{labels}}} {histogram.total:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{{labels}}} {histogram.count}')
+
+            lines.append('# HELP db_queries_total SQL statements executed, by route.')
+            lines.append('# TYPE db_queries_total counter')
+            for (route, method), count in sorted(self._db_queries.items()):
+                lines.append(f'db_queries_total{{route="{route}",method="{method}"}} {count}')
+
+            lines.append('# HELP db_seconds_total Time spent executing SQL statements, by route.')
+            lines.append('# TYPE db_seconds_total counter')
+            for (route, method), seconds in sorted(self._db_seconds.items()):
+                lines.append(f'db_seconds_total{{route="{route}",method="{method}"}} {seconds:.6f}')
+        return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['query_started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if started is not None and has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+        g.db_seconds = g.get('db_seconds', 0.0) + time.perf_counter() - started
+
+
+def init_metrics(app, engine):
+    # The engine is shared by every app built in this process
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+        g.db_queries = 0
+        g.db_seconds = 0.0
+
+    @app.after_request
+    def _record_request(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        db_queries = g.get('db_queries', 0)
+        db_seconds = g.get('db_seconds', 0.0)
+        request_metrics.observe(route, request.method, response.status_code, elapsed, db_queries, db_seconds)
+
+        if RESPONSE_HEADERS:
+            response.headers['X-DB-Queries'] = str(db_queries)
+            response.headers['Server-Timing'] = f'db;dur={db_seconds * 1000:.2f}, app;dur={elapsed * 1000:.2f}'
+        return response
+
+    def metrics():
+        return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule('/metrics', 'metrics', metrics, methods=['GET'])
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, inspect, select, update
+from .db import Base, engine
+from .classes import Schedule, Appointment, Notification, Service, parse_duration_minutes
+from .slots import available_slots_statement
+
+
+# Schema upgrades for databases created before a model change.
+#
+# There's no migration framework in this project, so each step here is written to be
+# safe to run repeatedly: it checks what already exists and only adds what's missing.
+# Run them with `flask --app run migrate`.
+
+
+def ensure_indexes(bind=engine):
+    # Create any index declared on the models that the database doesn't have yet
+    inspector = inspect(bind)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind)
+                created.append(index.name)
+    return created
+
+
+def ensure_schedule_slot_date(bind=engine):
+    # Schedule.Slot_Date replaced matching on the Day_Of_Week string. Add the column to
+    # older databases and backfill it from Start_Time
+    inspector = inspect(bind)
+    if not inspector.has_table('Schedule'):
+        return 0
+    columns = {column['name'] for column in inspector.get_columns('Schedule')}
+
+    with bind.begin() as connection:
+        if 'Slot_Date' not in columns:
+            connection.exec_driver_sql('ALTER TABLE Schedule ADD COLUMN Slot_Date DATE NULL')
+
+        backfilled = connection.execute(
+            update(Schedule)
+            .where(Schedule.Slot_Date.is_(None))
+            .values(Slot_Date=func.date(Schedule.Start_Time))
+        ).rowcount
+
+        # SQLite can't change a column's nullability in place, MySQL can
+        if bind.dialect.name == 'mysql':
+            connection.exec_driver_sql('ALTER TABLE Schedule MODIFY Slot_Date DATE NOT NULL')
+    return backfilled
+
+
+def ensure_service_duration_minutes(bind=engine):
+    # Service.Service_Duration_Minutes holds the parsed Service_Duration so the slot
+    # finder doesn't parse the string on every request. Add it and fill it in
+    inspector = inspect(bind)
+    if not inspector.has_table('Service'):
+        return 0
+    columns = {column['name'] for column in inspector.get_columns('Service')}
+
+    with bind.begin() as connection:
+        if 'Service_Duration_Minutes' not in columns:
+            connection.exec_driver_sql('ALTER TABLE Service ADD COLUMN Service_Duration_Minutes INTEGER NULL')
+
+        rows = connection.execute(
+            select(Service.Service_ID, Service.Service_Duration).where(Service.Service_Duration_Minutes.is_(None))
+        ).all()
+        backfilled = 0
+        for service_id, duration in rows:
+            minutes = parse_duration_minutes(duration)
+            if minutes is None:
+                continue
+            connection.execute(
+                update(Service).where(Service.Service_ID == service_id).values(Service_Duration_Minutes=minutes)
+            )
+            backfilled += 1
+    return backfilled
+
+
+def run_migrations(bind=engine):
+    # Columns first, so the indexes that use them can be created
+    backfilled = ensure_schedule_slot_date(bind)
+    durations = ensure_service_duration_minutes(bind)
+    return {
+        'schedule_slot_dates_backfilled': backfilled,
+        'service_durations_backfilled': durations,
+        'indexes_created': ensure_indexes(bind),
+    }
+
+
+def hot_queries():
+    # The filters the busiest routes run, with representative parameters
+    day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        'schedule_slots_for_day': select(Schedule.Start_Time, Schedule.End_Time, Schedule.Status).where(
+            Schedule.Barber_User_ID == 1,
+            Schedule.Slot_Date == day.date(),
+            Schedule.Status == 'Available',
+        ),
+        'appointments_for_day': select(Appointment.Appointment_ID).where(
+            Appointment.Barber_User_ID == 1,
+            Appointment.Appointment_Date_Time >= day,
+            Appointment.Appointment_Date_Time < day + timedelta(days=1),
+        ),
+        'appointments_for_week': select(Appointment.Appointment_ID, Appointment.Status).where(
+            Appointment.Barber_User_ID == 1,
+            Appointment.Appointment_Date_Time >= day,
+            Appointment.Appointment_Date_Time < day + timedelta(days=7),
+        ).order_by(Appointment.Appointment_Date_Time),
+        'service_availability': available_slots_statement(1, day.date(), day.date() + timedelta(days=13)),
+        'unread_notification_count': select(Notification.Notification_ID).where(
+            Notification.User_ID == 1,
+            Notification.Notification_Status == 'Unread',
+        ),
+        'notification_page': select(Notification.Notification_ID).where(
+            Notification.User_ID == 1,
+        ).order_by(Notification.Notification_Date_Time.desc(), Notification.Notification_ID.desc()).limit(50),
+    }
+
+
+def explain_hot_queries(bind=engine):
+    # Returns {query name: (plan rows, uses_index)} using the dialect's EXPLAIN
+    dialect = bind.dialect.name
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    results = {}
+    with bind.connect() as connection:
+        for name, statement in hot_queries().items():
+            # Expands IN (...) parameters into one placeholder per value
+            compiled = statement.compile(bind, compile_kwargs={'render_postcompile': True})
+            params = compiled.params
+            if compiled.positional:
+                params = tuple(params[key] for key in compiled.positiontup)
+            rows = connection.exec_driver_sql(prefix + str(compiled), params).mappings().all()
+            plan = [dict(row) for row in rows]
+            if dialect == 'sqlite':
+                # Every table access has to be an index or primary key SEARCH, e.g. "SEARCH
+                # Schedule USING INDEX ix_schedule_barber_date_status (...)". A "SCAN" reads
+                # the whole table (or index)
+                accesses = [str(row.get('detail')) for row in plan]
+                accesses = [detail for detail in accesses if detail.startswith(('SCAN ', 'SEARCH '))]
+                uses_index = bool(accesses) and all(
+                    detail.startswith('SEARCH ') and ('INDEX' in detail or 'PRIMARY KEY' in detail)
+                    for detail in accesses
+                )
+            else:
+                # MySQL: the "key" column names the index chosen for each table
+                uses_index = bool(plan) and all(row.get('key') for row in plan)
+            results[name] = (plan, uses_index)
+    return results
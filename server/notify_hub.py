@@ -0,0 +1,76 @@
+import os
+import queue
+import threading
+from server.serialization import dumps
+
+
+# In-process pub/sub for new notifications, feeding the SSE stream endpoint.
+#
+# Anything that inserts a Notification calls publish() after committing. Each open
+# stream holds a Subscriber with a small bounded queue; if a client falls too far
+# behind its events are dropped (it can catch up with Last-Event-ID on reconnect).
+# The number of open streams per worker is capped because each one holds a worker
+# thread for as long as the client stays connected. By default the cap leaves one of
+# the worker's GUNICORN_THREADS free for ordinary requests. The async app
+# (server/async_notify.py) serves streams without holding threads.
+
+MAX_STREAMS = int(os.getenv('NOTIFICATION_MAX_STREAMS', str(max(int(os.getenv('GUNICORN_THREADS', '4')) - 1, 0))))
+HEARTBEAT_SECONDS = float(os.getenv('NOTIFICATION_HEARTBEAT', '15'))
+
+
+class TooManyStreams(Exception):
+    pass
+
+
+class Subscriber:
+
+    def __init__(self, user_id, queue_size=100):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=queue_size)
+
+
+class NotificationHub:
+
+    def __init__(self, max_streams=MAX_STREAMS):
+        self.max_streams = max_streams
+        self._subscribers = {}  # user id -> set of Subscriber
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        with self._lock:
+            if self._count >= self.max_streams:
+                raise TooManyStreams()
+            subscriber = Subscriber(user_id)
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+            self._count += 1
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.user_id)
+            if subscribers and subscriber in subscribers:
+                subscribers.discard(subscriber)
+                self._count -= 1
+                if not subscribers:
+                    del self._subscribers[subscriber.user_id]
+
+    def publish(self, user_id, event):
+        # event is a dict with at least an 'id' key (the Notification_ID)
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(event)
+            except queue.Full:
+                pass
+
+    def stream_count(self):
+        return self._count
+
+
+def format_event(event):
+    return f"id: {event['id']}\nevent: notification\ndata: {dumps(event).decode()}\n\n"
+
+
+hub = NotificationHub()
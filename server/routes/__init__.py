@@ -0,0 +1,10 @@
+# Route blueprints, registered by server.create_app()
+BLUEPRINTS = (
+    'server.routes.auth',
+    'server.routes.services',
+    'server.routes.schedule',
+    'server.routes.bookings',
+    'server.routes.notifications',
+    'server.routes.barber_admin',
+    'server.routes.diagnostics',
+)
@@ -0,0 +1,166 @@
+import logging
+from flask import Blueprint, g, jsonify, request
+from server.classes import User
+from server.hashing import HashingBusy, hash_password, check_password, needs_rehash
+from server.auth import issue_token, revoke_token
+from server.cache import reference_cache
+from server.routes.common import Session, token_required
+
+
+# Login, logout, registration and profile updates
+bp = Blueprint('auth', __name__)
+
+log = logging.getLogger(__name__)
+
+
+@bp.route("/login", methods=['POST'])
+def login():
+    try:
+        data = request.get_json()
+        username = data.get('username')
+        password = data.get('password')
+
+        # Create a session instance
+        session = Session()
+
+        user = session.query(User).filter_by(Username=username).first()
+
+        if user and check_password(user.Password, password):
+            # Password is correct
+
+            # Transparently upgrade hashes created with an older work factor
+            if needs_rehash(user.Password):
+                user.Password = hash_password(password)
+                session.commit()
+
+            response_data = {
+                "success": True,
+                "token": issue_token(user.User_ID, user.User_Type),
+                "user": {
+                    "user_id": user.User_ID,  # Add the user ID to the response
+                    "username": user.Username,
+                    "role": user.User_Type,
+                    "first_name": user.F_Name,
+                    "last_name": user.L_Name,
+                    "email": user.Email,
+                    "phone": user.Phone_Number,
+                }
+            }
+            return jsonify(response_data)
+        else:
+            # Invalid credentials
+            return jsonify({"success": False, "message": "Invalid credentials"}), 401
+    except HashingBusy as e:
+        # The hashing pool is saturated, ask the client to back off
+        return jsonify({"success": False, "message": "Server busy, please retry"}), 503, {'Retry-After': str(e.retry_after)}
+    except Exception as e:
+        # Handle exceptions (e.g., database errors)
+        return jsonify({"success": False, "message": str(e)}), 500
+    finally:
+        # Ensure the session is closed
+        session.close()
+        
+
+
+@bp.route("/logout", methods=['POST'])
+@token_required()
+def logout():
+    # Revoke the token used for this request
+    revoke_token(g.auth)
+    return jsonify({"success": True}), 200
+
+
+@bp.route("/update-profile", methods=['PUT'])
+def update_profile():
+    # Your update profile logic here
+    try:
+        data = request.json
+        # print(data)
+        username = data.get('username')
+        
+        # Create a session instance
+        session = Session()
+
+        # Retrieve the user to be updated
+        user = session.query(User).filter_by(Username=username).first()
+
+        if user:
+            # Update user profile fields
+            user.F_Name = data.get('firstName', user.F_Name)
+            user.L_Name = data.get('lastName', user.L_Name)
+            user.Email = data.get('email', user.Email)
+            user.Phone_Number = data.get('phoneNumber', user.Phone_Number)
+            
+            # Commit changes to the database
+            session.commit()
+            # Barber names and contact details are part of the cached /barber_crud payload
+            reference_cache.invalidate()
+
+            return jsonify({"success": True, "user": {
+                "username": user.Username,
+                "firstName": user.F_Name,
+                "lastName": user.L_Name,
+                "email": user.Email,
+                "phoneNumber": user.Phone_Number
+            }})
+        else:
+            return jsonify({"success": False, "message": "User not found"}), 404
+    except Exception as e:
+        # Handle exceptions (e.g., database errors)
+        return jsonify({"success": False, "message": str(e)}), 500
+    finally:
+        # Ensure the session is closed
+        session.close()
+
+
+@bp.route("/register", methods=['POST'])
+def register():
+    try:
+        data = request.get_json()
+        username = data.get('username')
+        password = data.get('password')
+        first_name = data.get('firstName')
+        last_name = data.get('lastName')
+        email = data.get('email')
+        phone_number = data.get('phoneNumber')
+
+        # Check if the username already exists
+        session = Session()
+        existing_user = session.query(User).filter_by(Username=username).first()
+
+        if existing_user:
+            return jsonify({"success": False, "message": "Username already exists"}), 400
+
+        # Hash the plain text password using bcrypt
+        hashed_password = hash_password(password)
+
+        # Create a new user record with additional attributes
+        new_user = User(
+            Username=username,
+            Password=hashed_password,  # Store the hashed password
+            F_Name=first_name,  # First name
+            L_Name=last_name,  # Last name
+            Email=email,  # Email
+            Phone_Number=phone_number,  # Phone number
+            User_Type='customer'
+        )
+
+        # Add the user to the database
+        session.add(new_user)
+        session.commit()
+
+        return jsonify({"success": True, "message": "User registered successfully"})
+    
+    except HashingBusy as e:
+        # The hashing pool is saturated, ask the client to back off
+        return jsonify({"success": False, "message": "Server busy, please retry"}), 503, {'Retry-After': str(e.retry_after)}
+
+    except Exception as e:
+        # Log the error
+        log.exception('Registration failed')
+        # Handle exceptions (e.g., database errors)
+        return jsonify({"success": False, "message": str(e)}), 500
+
+    finally:
+        # Ensure the session is closed
+        session.close()
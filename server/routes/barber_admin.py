@@ -0,0 +1,108 @@
+import logging
+from flask import Blueprint, jsonify, request
+from server.classes import User, Service, Barber_Service, serializer
+from server.cache import reference_cache
+from server.logging_setup import debug_payload
+from server.routes.common import Session, cached_json
+
+
+# Admin view of which barber offers which service
+bp = Blueprint('barber_admin', __name__)
+
+log = logging.getLogger(__name__)
+
+
+BARBER = serializer(User, 'account')
+SERVICE = serializer(Service)
+
+
+def _load_barbers_services(barber_ids=None):
+    session = Session()
+    try:
+        # Build the whole barber x service matrix from one query: every admin/barber user
+        # outer joined to their Barber_Service rows and the matching Service
+        query = (
+            session.query(*BARBER.columns, *SERVICE.columns, Barber_Service.Status)
+            .outerjoin(Barber_Service, Barber_Service.Barber_User_ID == User.User_ID)
+            .outerjoin(Service, Service.Service_ID == Barber_Service.Service_ID)
+            .filter(User.User_Type.in_(['admin', 'barber']))
+        )
+        if barber_ids:
+            query = query.filter(User.User_ID.in_(barber_ids))
+
+        # Create a dictionary to store the barber data
+        barbers_dict = {}
+        service_start = len(BARBER.keys)
+        service_end = service_start + len(SERVICE.keys)
+
+        # Group the joined rows by barber in Python
+        for row in query.all():
+            barber_data = barbers_dict.get(row[0])
+            if barber_data is None:
+                barber_data = BARBER.dump(row)
+                barber_data["Services"] = []
+                # Add the barber data to the dictionary with the barber ID as the key
+                barbers_dict[row[0]] = barber_data
+
+            # Barbers without any services still get an (empty) entry
+            if row[service_start] is not None:
+                service_data = SERVICE.dump(row[service_start:service_end])
+                service_data["Status"] = row[service_end]  # Include the Status attribute
+                barber_data["Services"].append(service_data)
+
+        return barbers_dict
+    finally:
+        session.close()
+
+
+@bp.route('/barber_crud', methods=['GET'])
+def get_all_barbers_services():
+    # Optional ?barber_ids=1,2,3 filter so the admin UI can refresh a single row
+    barber_ids = request.args.get('barber_ids')
+    if barber_ids:
+        try:
+            barber_ids = tuple(sorted({int(barber_id) for barber_id in barber_ids.split(',') if barber_id.strip()}))
+        except ValueError:
+            return jsonify({"error": "barber_ids must be a comma separated list of integers"}), 400
+
+    try:
+        # Served from the reference cache, every barber/service write invalidates it
+        return cached_json(reference_cache.get(
+            ('barber_crud', barber_ids or None), lambda: _load_barbers_services(barber_ids)
+        ), 'barber_crud')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route('/barber_crud/<int:user_id>/services/<int:service_id>', methods=['PUT'])
+def update_barber_service(user_id, service_id):
+    # Get JSON data from the request
+    data = request.get_json()
+    debug_payload(log, 'barber_crud toggle payload', lambda: data)
+
+    try:
+        session = Session()
+
+        # Query the Barber_Service table to find the record for the barber and service
+        barber_service = session.query(Barber_Service).filter_by(Barber_User_ID=user_id, Service_ID=service_id).first()
+
+        if barber_service:
+            # Toggle the Status attribute (assuming 'Enabled' becomes 'Disabled' and vice versa)
+            if barber_service.Status == 'Enabled':
+                barber_service.Status = 'Disabled'
+            else:
+                barber_service.Status = 'Enabled'
+
+            session.commit()
+            reference_cache.invalidate()
+
+            # Return a JSON response with the updated status
+            response_data = {'message': 'Service status updated successfully', 'status': barber_service.Status}
+            return jsonify(response_data), 200
+        else:
+            return jsonify({'message': 'Service not found'}), 404
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
@@ -0,0 +1,376 @@
+import logging
+import os
+from datetime import datetime, timedelta
+from flask import Blueprint, jsonify, request
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from server.classes import User, Service, Schedule, Appointment, Notification, Payment_Type, serializer
+from server.mailer import get_dispatcher
+from server.availability import availability_index
+from server.logging_setup import debug_payload
+from server.notify_hub import hub as notification_hub
+from server.slots import covering_slots
+from server.routes.common import Session, render
+
+
+# Creating bookings and the barber's appointment views
+bp = Blueprint('bookings', __name__)
+
+log = logging.getLogger(__name__)
+
+
+# Longest date range /weeklyappointments will return, enough for a month calendar view
+WEEKLY_APPOINTMENTS_MAX_DAYS = 42
+
+APPOINTMENT = serializer(Appointment)
+DAILY_APPOINTMENT = serializer(Appointment, 'daily')
+APPOINTMENT_CONTACT = serializer(Appointment, 'contact')
+CUSTOMER_CONTACT = serializer(User, 'contact')
+CUSTOMER_ACCOUNT = serializer(User, 'account')
+APPOINTMENT_SERVICE = serializer(Service, 'appointment')
+NOTIFICATION = serializer(Notification)
+
+
+def appointment_window(args):
+    # ?start=YYYY-MM-DD&end=YYYY-MM-DD, both inclusive. Defaults to the current week
+    # (Monday to Sunday), or the week starting at start. Raises ValueError
+    if args.get('start'):
+        start = datetime.strptime(args['start'], '%Y-%m-%d').date()
+    else:
+        today = datetime.now().date()
+        start = today - timedelta(days=today.weekday())
+    end = datetime.strptime(args['end'], '%Y-%m-%d').date() if args.get('end') else start + timedelta(days=6)
+
+    if end < start:
+        raise ValueError('end is before start')
+    if (end - start).days >= WEEKLY_APPOINTMENTS_MAX_DAYS:
+        raise ValueError(f'At most {WEEKLY_APPOINTMENTS_MAX_DAYS} days can be requested')
+    return start, end
+
+
+def weekly_appointments_statement(user_id, start, end):
+    # Half-open range over the (Barber_User_ID, Appointment_Date_Time) index, selecting
+    # only the columns the calendar shows. Shared with the async app
+    return (
+        select(*APPOINTMENT.columns)
+        .where(
+            Appointment.Barber_User_ID == user_id,
+            Appointment.Appointment_Date_Time >= datetime.combine(start, datetime.min.time()),
+            Appointment.Appointment_Date_Time < datetime.combine(end + timedelta(days=1), datetime.min.time())
+        )
+        .order_by(Appointment.Appointment_Date_Time)
+    )
+
+
+def format_weekly_appointments(rows, start, end):
+    return {"appointments": APPOINTMENT.dump_all(rows), "start": start, "end": end}
+
+
+@bp.route('/weeklyappointments/<int:user_id>', methods=['GET'])
+def fetchWeeklyAppointments(user_id):
+    try:
+        start, end = appointment_window(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid date range: {e}"}), 400
+
+    try:
+        session = Session()
+
+        # The barber's appointments in the window, as plain rows
+        rows = session.execute(weekly_appointments_statement(user_id, start, end)).all()
+        debug_payload(log, 'weeklyappointments', lambda: rows)
+
+        return render(format_weekly_appointments(rows, start, end))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        session.close()
+
+
+@bp.route('/bookings', methods=['POST'])
+def create_booking():
+    # Get data from the request's JSON body
+    data = request.get_json()
+
+    # Extract data from the request
+    first_name = data.get('first_name')
+    last_name = data.get('last_name')
+    email = data.get('email')
+    phone = data.get('phone')
+    barber_id = data.get('barber_id')
+    date_str = data.get('date')
+    start_time_str = data.get('start_time')
+    end_time_str = data.get('end_time')
+    service = data.get('service_id')
+    customer_id = data.get('customer_id')
+    payment_method_id = data.get('payment_method')
+    # print('customer_id', customer_id)
+
+    # Convert date and times to the desired format
+    slot_date = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z').date()
+    date_formatted = slot_date.isoformat()
+    start_time_formatted = start_time_str + ':00'  # Add seconds to start_time if needed
+    start_datetime = datetime.combine(slot_date, datetime.strptime(start_time_str, '%H:%M').time())
+    end_datetime = datetime.combine(slot_date, datetime.strptime(end_time_str, '%H:%M').time())
+
+    try:
+        session = Session()
+
+        # Determine the selected schedule slots: one for a service that fits a slot, or
+        # every back-to-back slot a longer service overlaps
+        slots = session.query(Schedule.Schedule_ID, Schedule.Start_Time, Schedule.End_Time).filter(
+            Schedule.Barber_User_ID == barber_id,
+            Schedule.Slot_Date == slot_date,
+            Schedule.Start_Time < end_datetime,
+            Schedule.End_Time > start_datetime,
+        ).order_by(Schedule.Start_Time).all()
+        slot_ids = covering_slots(slots, start_datetime, end_datetime)
+
+        if slot_ids:
+            # The appointment points at the first slot it covers
+            selected_schedule_id = slot_ids[0]
+
+            # Get service data 
+            service_booked = session.query(Service).filter_by(Service_ID=service).first()
+            service_name = service_booked.Service_Name if service_booked else None
+
+            # Claim the slots atomically: the UPDATE only matches slots that are still
+            # Available, so when two requests race for any of them exactly one claims all
+            claimed = session.query(Schedule).filter(
+                Schedule.Schedule_ID.in_(slot_ids),
+                Schedule.Status == 'Available'
+            ).update({'Status': 'Unavailable'}, synchronize_session=False)
+
+            if claimed != len(slot_ids):
+                session.rollback()
+                return jsonify({'error': 'Selected time slot is no longer available'}), 409
+
+            # User is authenticated or not, use data from the request
+            appointment = Appointment(
+                F_Name=first_name,
+                L_Name=last_name,
+                Email=email,
+                Phone_Number=phone,
+                Customer_User_ID=customer_id,
+                Barber_User_ID=barber_id,
+                Appointment_Date_Time=start_datetime,  # Use start_datetime as the appointment time
+                Appointment_End_Date_Time=end_datetime,
+                Status='Confirmed',  # Set an appropriate status
+                Service_ID=service,
+                Schedule_ID=selected_schedule_id,  # Assign the Schedule_ID from the selected schedule
+                Payment_Type_ID=payment_method_id
+            )
+
+            session.add(appointment)
+            session.flush()  # Flush to obtain the Appointment_ID without committing
+
+            # Create a notification
+            appointment_id = appointment.Appointment_ID  # Get the appointment ID
+            notification = Notification(
+                User_ID=barber_id,
+                Appointment_ID=appointment_id,
+                Message='Your appointment has been booked.',
+                Notification_Type='Booking Confirmation',
+                Notification_Date_Time=datetime.now(),
+                Notification_Status='Unread'
+            )
+
+            session.add(notification)
+            session.flush()  # Assigns the Notification_ID for the stream event
+            notification_event = NOTIFICATION.dump((
+                notification.Notification_ID, appointment_id, notification.Notification_Type,
+                notification.Message, notification.Notification_Date_Time, notification.Notification_Status
+            ))
+
+            # The slot claim, appointment and notification commit (or roll back) together
+            session.commit()
+
+            # Push the new notification to any open streams for the barber
+            notification_hub.publish(int(barber_id), notification_event)
+
+            # Keep this worker's availability index in step with the database
+            for _, slot_start, slot_end in slots:
+                availability_index.set_status(int(barber_id), slot_date, slot_start, slot_end, 'Unavailable')
+
+        else:
+            # Handle the case when the selected schedule is None, indicating an error
+            # print('Selected schedule not found')
+            return jsonify({'error': 'Selected schedule not found'}), 400
+        
+
+        # Query barber/admin's email by barber_id
+        barber = session.query(User).filter_by(User_ID=barber_id).first()
+        if barber:
+            barber_email = barber.Email
+
+            # Emails are handed to the background dispatcher so the booking response
+            # doesn't wait on (or fail because of) the SMTP server
+            sender_email = os.getenv('EMAIL_ADDRESS')
+            dispatcher = get_dispatcher()
+
+            # Now send email to customer and barber that appointment was booked with relevant information of appointment
+            # Email to customer
+            message = f"""\
+            Subject: Appointment Confirmation
+
+            Dear {first_name} {last_name},
+            Your appointment has been booked with {barber.F_Name} on {date_formatted} at {start_time_formatted} for {service_name}.
+            """
+            if not dispatcher.submit(sender_email, email, message):
+                log.warning('Email queue full, customer confirmation dropped')
+
+            # Email to barber/admin
+            message = f"""\
+            Subject: New Appointment Scheduled
+
+            Dear {barber.F_Name},
+            A new appointment has been scheduled by {first_name} {last_name} on {date_formatted} at {start_time_formatted} for {service_name}.
+            """
+            if not dispatcher.submit(sender_email, barber_email, message):
+                log.warning('Email queue full, barber notification dropped')
+        else:
+            return jsonify({'error': 'Barber not found'}), 404
+
+        session.close()
+
+        # Return a success response
+        return jsonify({'message': 'Appointment created successfully'}), 201
+
+    except Exception as e:
+        log.exception('Booking failed')
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+def appointment_details_statement(appointment_id):
+    # The appointment with its customer's account and service details in one row.
+    # Shared with the async app
+    customer = aliased(User)
+    return (
+        select(
+            *APPOINTMENT.columns,
+            *CUSTOMER_ACCOUNT.columns_of(customer),
+            Service.Service_Name, Service.Service_Description, Service.Service_Price,
+        )
+        .outerjoin(customer, customer.User_ID == Appointment.Customer_User_ID)
+        .outerjoin(Service, Service.Service_ID == Appointment.Service_ID)
+        .where(Appointment.Appointment_ID == appointment_id)
+    )
+
+
+def format_appointment_details(row):
+    appointment_details = APPOINTMENT.dump(row)
+    account_end = len(APPOINTMENT.keys) + len(CUSTOMER_ACCOUNT.keys)
+    account = CUSTOMER_ACCOUNT.dump(row[len(APPOINTMENT.keys):account_end])
+    service = row[account_end:]
+
+    # Use the customer's account details when the appointment is linked to a user
+    if account.pop('User_ID') is not None:
+        appointment_details.update(account)
+
+    if service[0] is not None:
+        appointment_details.update(zip(('Service_Name', 'Service_Description', 'Service_Price'), service))
+
+    return appointment_details
+
+
+@bp.route('/appointments/<int:appointment_id>', methods=['GET'])
+def get_appointment_details(appointment_id):
+    try:
+        # Create a new session
+        session = Session()
+
+        # Query the Appointment table by appointment_id
+        row = session.execute(appointment_details_statement(appointment_id)).first()
+
+        # Check if the appointment exists
+        if row is not None:
+            return render(format_appointment_details(row))
+        else:
+            # If the appointment doesn't exist, return a 404 error
+            return jsonify({'error': 'Appointment not found'}), 404
+    except Exception as e:
+        # Handle exceptions (e.g., database errors)
+        return jsonify({'error': str(e)}), 500
+    finally:
+        # Close the session
+        session.close()
+
+
+def daily_appointments_statement(user_id, day_start):
+    # Half-open range for the day so the (Barber_User_ID, Appointment_Date_Time) index can be used.
+    # One row per appointment with its service, slot, payment type and customer columns.
+    # Appointments without a service or slot are left out, as before. Shared with the async app
+    day_end = day_start + timedelta(days=1)
+    customer = aliased(User)
+    return (
+        select(
+            *DAILY_APPOINTMENT.columns,
+            Appointment.Customer_User_ID,
+            *APPOINTMENT_CONTACT.columns,
+            customer.User_ID, *CUSTOMER_CONTACT.columns_of(customer),
+            *APPOINTMENT_SERVICE.columns,
+            Schedule.Start_Time, Schedule.End_Time,
+            Payment_Type.Payment_Type_Name,
+        )
+        .join(Service, Service.Service_ID == Appointment.Service_ID)
+        .join(Schedule, Schedule.Schedule_ID == Appointment.Schedule_ID)
+        .outerjoin(Payment_Type, Payment_Type.Payment_Type_ID == Appointment.Payment_Type_ID)
+        .outerjoin(customer, customer.User_ID == Appointment.Customer_User_ID)
+        .where(
+            Appointment.Barber_User_ID == user_id,
+            Appointment.Appointment_Date_Time >= day_start,
+            Appointment.Appointment_Date_Time < day_end
+        )
+    )
+
+
+def format_daily_appointments(rows):
+    # Slice each row back into the parts the statement above selected
+    appointment_end = len(DAILY_APPOINTMENT.keys)
+    contact_end = appointment_end + 1 + len(APPOINTMENT_CONTACT.keys)
+    account_end = contact_end + 1 + len(CUSTOMER_CONTACT.keys)
+    service_end = account_end + len(APPOINTMENT_SERVICE.keys)
+
+    formatted_appointments = []
+    for row in rows:
+        customer_user_id = row[appointment_end]
+
+        # Use the customer's account details when the appointment is linked to a user,
+        # otherwise the details typed in with the booking
+        if customer_user_id:
+            if row[contact_end] is not None:
+                customer_details = CUSTOMER_CONTACT.dump(row[contact_end + 1:account_end])
+            else:
+                customer_details = dict.fromkeys(CUSTOMER_CONTACT.keys)
+        else:
+            customer_details = APPOINTMENT_CONTACT.dump(row[appointment_end + 1:contact_end])
+        customer_details['customer_user_id'] = customer_user_id
+
+        start_time, end_time, payment_method = row[service_end:]
+        formatted_appointment = DAILY_APPOINTMENT.dump(row)
+        formatted_appointment.update(
+            customer=customer_details,
+            service=APPOINTMENT_SERVICE.dump(row[account_end:service_end]),
+            start_time=start_time.time(),
+            end_time=end_time.time(),
+            payment_method=payment_method,
+        )
+        formatted_appointments.append(formatted_appointment)
+    return formatted_appointments
+
+
+@bp.route('/dailyappointments/<int:user_id>/<string:date>', methods=['GET'])
+def get_appointments_for_barber_by_date(user_id, date):
+    try:
+        session = Session()
+
+        day_start = datetime.strptime(date, '%Y-%m-%d')
+        rows = session.execute(daily_appointments_statement(user_id, day_start)).all()
+
+        return render({'appointments': format_daily_appointments(rows)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
@@ -0,0 +1,48 @@
+from functools import wraps
+from flask import Response, g, jsonify, request
+from sqlalchemy.orm import sessionmaker
+from server.db import engine
+from server.auth import InvalidToken, verify_token
+from server.http_cache import CACHE_CONTROL, conditional_response
+from server.serialization import encode
+
+
+# Shared by the route blueprints
+
+# Create a session factory and bind it to your SQLAlchemy engine
+Session = sessionmaker(bind=engine)
+
+
+def token_required(roles=None):
+    # Verifies the "Authorization: Bearer <token>" header issued by /login without a
+    # database lookup. The token's user id and role are available as g.auth
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            header = request.headers.get('Authorization', '')
+            if not header.startswith('Bearer '):
+                return jsonify({'message': 'Authentication required'}), 401
+            token = header[len('Bearer '):]
+            try:
+                g.auth = verify_token(token)
+            except InvalidToken as e:
+                return jsonify({'message': str(e)}), 401
+            if roles and g.auth['role'] not in roles:
+                return jsonify({'message': 'Forbidden'}), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def cached_json(entry, policy):
+    # Response for a reference cache payload: 304 when the client's ETag still matches,
+    # otherwise the payload, compressed when the client accepts it
+    body, status, headers = conditional_response(entry, request.headers, CACHE_CONTROL[policy])
+    return Response(body, status=status, headers=headers, mimetype='application/json')
+
+
+def render(payload, status=200):
+    # JSON, or MessagePack when the client asks for it, encoded straight from the
+    # serializers' database values
+    body, mimetype = encode(payload, request.headers.get('Accept'))
+    return Response(body, status=status, mimetype=mimetype, headers={'Vary': 'Accept'})
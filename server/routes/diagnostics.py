@@ -0,0 +1,19 @@
+from flask import Blueprint, jsonify
+from server.db import pool_status
+from server.mailer import get_dispatcher
+
+
+# Per-worker internals for operators
+bp = Blueprint('diagnostics', __name__)
+
+
+@bp.route('/diagnostics/mail', methods=['GET'])
+def get_mail_stats():
+    # Queue depth and send latency of the background email dispatcher
+    return jsonify(get_dispatcher().stats()), 200
+
+
+@bp.route('/diagnostics/pool', methods=['GET'])
+def get_pool_stats():
+    # Connection pool state for this worker, used to size workers against the DB connection limit
+    return jsonify(pool_status()), 200
@@ -0,0 +1,242 @@
+import queue
+from datetime import datetime
+from flask import Blueprint, Response, g, jsonify, request
+from sqlalchemy import func, and_, or_, select
+from server.auth import InvalidToken, STREAM_TOKEN_MAX_AGE, issue_stream_token, verify_stream_token
+from server.classes import Notification, serializer
+from server.notify_hub import hub as notification_hub, TooManyStreams, HEARTBEAT_SECONDS, format_event
+from server.routes.common import Session, render, token_required
+
+
+# Notification list, unread count, live stream and read receipts
+bp = Blueprint('notifications', __name__)
+
+
+NOTIFICATION_PAGE_SIZE = 50
+NOTIFICATION_MAX_PAGE_SIZE = 200
+
+NOTIFICATION = serializer(Notification)
+
+
+def _notification_cursor(notification_date_time, notification_id):
+    return f"{notification_date_time.strftime('%Y-%m-%dT%H:%M:%S.%f')}_{notification_id}"
+
+
+def _parse_notification_cursor(cursor):
+    date_part, id_part = cursor.rsplit('_', 1)
+    return datetime.strptime(date_part, '%Y-%m-%dT%H:%M:%S.%f'), int(id_part)
+
+
+def notification_page_args(args):
+    # Keyset pagination, newest first: ?limit=N&before=<next_cursor from the previous page>
+    # and ?unread=true to only return unread notifications. Raises ValueError
+    limit = min(int(args.get('limit', NOTIFICATION_PAGE_SIZE)), NOTIFICATION_MAX_PAGE_SIZE)
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    before = args.get('before')
+    before = _parse_notification_cursor(before) if before else None
+    unread_only = args.get('unread', '').lower() in ('1', 'true', 'yes')
+    return limit, before, unread_only
+
+
+def notification_page_statement(user_id, limit, before, unread_only):
+    # Shared with the async app
+    statement = select(*NOTIFICATION.columns).where(Notification.User_ID == user_id)
+
+    if unread_only:
+        statement = statement.where(Notification.Notification_Status == 'Unread')
+    if before:
+        before_date_time, before_id = before
+        statement = statement.where(or_(
+            Notification.Notification_Date_Time < before_date_time,
+            and_(Notification.Notification_Date_Time == before_date_time, Notification.Notification_ID < before_id)
+        ))
+
+    # Fetch one extra row to know whether there is another page
+    return (
+        statement.order_by(Notification.Notification_Date_Time.desc(), Notification.Notification_ID.desc())
+        .limit(limit + 1)
+    )
+
+
+def format_notification_page(rows, limit):
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Convert notifications to a list of dictionaries with desired fields
+    formatted_notifications = NOTIFICATION.dump_all(rows)
+
+    next_cursor = _notification_cursor(rows[-1][4], rows[-1][0]) if has_more else None
+    return {'notifications': formatted_notifications, 'next_cursor': next_cursor}
+
+
+def unread_count_statement(user_id):
+    # A COUNT over the (User_ID, Notification_Status) index
+    return select(func.count(Notification.Notification_ID)).where(
+        Notification.User_ID == user_id,
+        Notification.Notification_Status == 'Unread'
+    )
+
+
+def missed_notifications_statement(user_id, last_event_id):
+    # Shared with the async app: what a reconnecting stream missed since Last-Event-ID
+    return (
+        select(*NOTIFICATION.columns)
+        .where(Notification.User_ID == user_id, Notification.Notification_ID > last_event_id)
+        .order_by(Notification.Notification_ID)
+    )
+
+
+@bp.route('/notifications/<int:user_id>', methods=['GET'])
+@token_required()
+def get_notifications(user_id):
+    # The token proves who the user is, so there's no need to look them up first
+    if g.auth['uid'] != user_id and g.auth['role'] != 'admin':
+        return jsonify({'message': 'Forbidden'}), 403
+
+    try:
+        limit, before, unread_only = notification_page_args(request.args)
+    except ValueError:
+        return jsonify({'error': 'Invalid limit or before cursor'}), 400
+
+    try:
+        session = Session()
+
+        # Query the Notification table to fetch a page of notifications for the user
+        rows = session.execute(notification_page_statement(user_id, limit, before, unread_only)).all()
+
+        return render(format_notification_page(rows, limit))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+@bp.route('/notifications/<int:user_id>/unread-count', methods=['GET'])
+@token_required()
+def get_unread_notification_count(user_id):
+    # Cheap endpoint for the polling badge, a COUNT over the (User_ID, Notification_Status) index
+    if g.auth['uid'] != user_id and g.auth['role'] != 'admin':
+        return jsonify({'message': 'Forbidden'}), 403
+
+    try:
+        session = Session()
+
+        unread_count = session.scalar(unread_count_statement(user_id))
+
+        return render({'unread_count': unread_count})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+@bp.route('/notifications/<int:user_id>/stream-token', methods=['POST'])
+@token_required()
+def create_stream_token(user_id):
+    # A short-lived token for ?stream_token= on the stream below, so the session token
+    # never ends up in a URL. Clients fetch a new one each time EventSource reconnects
+    if g.auth['uid'] != user_id and g.auth['role'] != 'admin':
+        return jsonify({'message': 'Forbidden'}), 403
+    return jsonify({'stream_token': issue_stream_token(g.auth), 'expires_in': STREAM_TOKEN_MAX_AGE}), 200
+
+
+@bp.route('/notifications/<int:user_id>/stream', methods=['GET'])
+def stream_notifications(user_id):
+    # Server-Sent Events: pushes each new notification for the user as it is created,
+    # with a comment heartbeat to keep proxies from closing an idle connection.
+    # Each open stream holds a gunicorn thread; the async app serves many more
+    try:
+        verify_stream_token(request.args.get('stream_token', ''), user_id)
+    except InvalidToken as e:
+        return jsonify({'message': str(e)}), 401
+
+    try:
+        subscriber = notification_hub.subscribe(user_id)
+    except TooManyStreams:
+        return jsonify({'message': 'Too many open streams, please retry'}), 503, {'Retry-After': '5'}
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+
+    def generate():
+        last_sent = 0
+        # Replay anything missed since the client's last event. We subscribed first,
+        # so nothing created in between can be lost (duplicates are skipped below)
+        if last_event_id and last_event_id.isdigit():
+            last_sent = int(last_event_id)
+            session = Session()
+            try:
+                missed = session.execute(missed_notifications_statement(user_id, last_sent)).all()
+            finally:
+                session.close()
+            for row in missed:
+                event = NOTIFICATION.dump(row)
+                last_sent = event['id']
+                yield format_event(event)
+
+        # Tell the browser how long to wait before reconnecting
+        yield 'retry: 3000\n\n'
+
+        while True:
+            try:
+                event = subscriber.queue.get(timeout=HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ': heartbeat\n\n'
+                continue
+            if event['id'] <= last_sent:
+                continue
+            last_sent = event['id']
+            yield format_event(event)
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # Stop nginx from buffering the stream
+    })
+    # Release the stream slot when the response is closed, including responses whose
+    # body is never iterated (HEAD requests, clients that disconnect straight away)
+    response.call_on_close(lambda: notification_hub.unsubscribe(subscriber))
+    return response
+
+
+# Define a route to mark a notification as read
+@bp.route('/mark-as-read/<int:notification_id>', methods=['PUT'])
+def mark_as_read(notification_id):
+    try:
+        session = Session()
+
+        # Query the Notification table to find the notification by ID
+        notification = session.query(Notification).filter_by(Notification_ID=notification_id).first()
+
+        if notification:
+            # Update the notification status to "Read"
+            notification.Notification_Status = 'Read'
+            session.commit()
+            return jsonify({'message': 'Notification marked as read.'}), 200
+        else:
+            return jsonify({'message': 'Notification not found.'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+@bp.route('/mark-all-as-read', methods=['PUT'])
+def mark_all_notifications_as_read():
+    try:
+        data = request.get_json()
+        notification_ids = data.get('notificationIds', [])
+
+        session = Session()
+
+        # Update the status of all notifications with the given IDs to 'Read'
+        session.query(Notification).filter(Notification.Notification_ID.in_(notification_ids)).update(
+            {"Notification_Status": "Read"},
+            synchronize_session=False
+        )
+
+        session.commit()
+        return jsonify({'success': True}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
@@ -0,0 +1,357 @@
+from datetime import datetime, timedelta
+from flask import Blueprint, jsonify, request
+from sqlalchemy import and_, or_, exists, tuple_
+from server.classes import Schedule, Appointment
+from server.availability import availability_index
+from server.slots import service_duration, available_slots_statement, barber_start_times, next_start_times
+from server.routes.common import Session, render, token_required
+
+
+# Availability lookups, blocking time and schedule generation
+bp = Blueprint('schedule', __name__)
+
+
+# Default and longest date range /service/<service_id>/availability searches
+SERVICE_AVAILABILITY_DAYS = 14
+SERVICE_AVAILABILITY_MAX_DAYS = 31
+
+
+def _availability_window(args):
+    # ?start=YYYY-MM-DD&end=YYYY-MM-DD, both inclusive, from today by default. Raises ValueError
+    start = parse_date(args['start']) if args.get('start') else datetime.now().date()
+    end = parse_date(args['end']) if args.get('end') else start + timedelta(days=SERVICE_AVAILABILITY_DAYS - 1)
+    if end < start:
+        raise ValueError('end is before start')
+    if (end - start).days >= SERVICE_AVAILABILITY_MAX_DAYS:
+        raise ValueError(f'At most {SERVICE_AVAILABILITY_MAX_DAYS} days can be requested')
+    return start, end
+
+
+@bp.route('/service/<int:service_id>/availability', methods=['GET'])
+def get_service_availability(service_id):
+    # Start times in the date window where the whole service fits into a barber's
+    # back-to-back Available slots, for every barber offering the service
+    try:
+        start, end = _availability_window(request.args)
+    except ValueError as e:
+        return jsonify(error=f'Invalid date range: {e}'), 400
+
+    try:
+        # Create a session
+        session = Session()
+
+        found, minutes = service_duration(session, service_id)
+        if not found:
+            return jsonify(message="Service not found"), 404
+
+        # Every barber's Available slots in the window, in one query
+        rows = session.execute(available_slots_statement(service_id, start, end)).all()
+
+        availability_data = []
+        for barber_id, barber_name, start_times in barber_start_times(rows, minutes, not_before=datetime.now()):
+            for slot_start, slot_end in start_times:
+                availability_data.append({
+                    'barber_id': barber_id,
+                    'barber_name': barber_name,
+                    'date': slot_start.date(),
+                    # Schedule.Day_Of_Week holds the date as YYYY-MM-DD
+                    'day_of_week': slot_start.date(),
+                    'start_time': slot_start.strftime('%H:%M'),
+                    'end_time': slot_end.strftime('%H:%M'),
+                    'availability': 'Available'
+                })
+
+        return render(availability_data)
+
+    except Exception as e:
+        return jsonify(error=str(e)), 500
+    finally:
+        session.close()
+
+
+# How far ahead /service/<service_id>/next-available looks, and how many slots it returns
+NEXT_AVAILABLE_DAYS = 30
+NEXT_AVAILABLE_K = 5
+NEXT_AVAILABLE_MAX_K = 50
+
+
+def _next_available_args(args):
+    # ?after=YYYY-MM-DD[THH:MM]&k=N, after defaults to (and is never earlier than) now. Raises ValueError
+    now = datetime.now()
+    after = now
+    if args.get('after'):
+        # JavaScript's toISOString() sends UTC with a "Z" suffix
+        after = datetime.fromisoformat(args['after'].replace('Z', '+00:00'))
+        if after.tzinfo is not None:
+            # Slot times are stored as naive server-local times
+            after = after.astimezone().replace(tzinfo=None)
+    k = int(args.get('k', NEXT_AVAILABLE_K))
+    if not 1 <= k <= NEXT_AVAILABLE_MAX_K:
+        raise ValueError(f'k must be between 1 and {NEXT_AVAILABLE_MAX_K}')
+    return max(after, now), k
+
+
+@bp.route('/service/<int:service_id>/next-available', methods=['GET'])
+def get_next_available(service_id):
+    # The k earliest start times for the service across every barber offering it,
+    # for customers who don't mind which barber they get
+    try:
+        after, k = _next_available_args(request.args)
+    except ValueError as e:
+        return jsonify(error=f'Invalid parameters: {e}'), 400
+
+    try:
+        # Create a session
+        session = Session()
+
+        found, minutes = service_duration(session, service_id)
+        if not found:
+            return jsonify(message="Service not found"), 404
+
+        start_times = next_start_times(session, service_id, minutes, after, k, NEXT_AVAILABLE_DAYS)
+
+        return render([
+            {
+                'barber_id': barber_id,
+                'barber_name': barber_name,
+                'date': slot_start.date(),
+                'start_time': slot_start.strftime('%H:%M'),
+                'end_time': slot_end.strftime('%H:%M'),
+            }
+            for slot_start, slot_end, barber_id, barber_name in start_times
+        ])
+
+    except Exception as e:
+        return jsonify(error=str(e)), 500
+    finally:
+        session.close()
+
+
+# Endpoint to retrieve available dates for a selected barber by ID
+@bp.route('/schedule/<int:barber_id>/available-dates', methods=['GET'])
+def get_available_dates_for_barber(barber_id):
+    try:
+        # Served from the in-memory availability index
+        sorted_distinct_dates = [day.isoformat() for day in availability_index.available_dates(barber_id)]
+
+        return render({'available_dates': sorted_distinct_dates})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/schedule/<int:barber_id>/available-time-slots', methods=['GET'])
+def get_available_time_slots_for_barber(barber_id):
+    try:
+        date_str = request.args.get('date')
+
+        # Parse the date string into a date to look up the Slot_Date
+        slot_date = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S GMT').date()
+
+        # Look up the available time slots for the selected barber on the selected date
+        available_time_slots = availability_index.slots(barber_id, slot_date, status='Available')
+
+        # Create a dictionary with auto-incremented slot numbers
+        time_slots_dict = {}
+        for index, (start_time, end_time, _) in enumerate(available_time_slots, start=1):
+            time_slots_dict[index] = {
+                'start_time': start_time.strftime('%H:%M'),
+                'end_time': end_time.strftime('%H:%M')
+            }
+
+        # Return the time_slots_dict as JSON
+        return render({'available_time_slots': time_slots_dict})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+
+
+def format_time_slots(slots):
+    # Create a dictionary with auto-incremented slot numbers
+    time_slots_dict = {}
+    for index, (start_time, end_time, status) in enumerate(slots, start=1):
+        time_slots_dict[index] = {
+            'start_time': start_time.strftime('%H:%M'),
+            'end_time': end_time.strftime('%H:%M'),
+            'status': status
+        }
+    return time_slots_dict
+
+
+@bp.route('/availabletimeslots/<int:user_id>/<string:date>', methods=['GET'])
+def get_available_time_slots(user_id, date):
+    try:
+        # Look up the available time slots for the selected barber in the availability index
+        available_time_slots = availability_index.slots(user_id, parse_date(date), status='Available')
+
+        # Return the time_slots_dict as JSON
+        return render({'available_time_slots': format_time_slots(available_time_slots)})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/unavailabletimeslots/<int:user_id>/<string:date>', methods=['GET'])
+def get_unavailable_time_slots(user_id, date):
+    try:
+        # Look up the unavailable time slots for the selected barber in the availability index
+        unavailable_time_slots = availability_index.slots(user_id, parse_date(date), status='Unavailable')
+
+        # Return the time_slots_dict as JSON
+        return render({'unavailable_time_slots': format_time_slots(unavailable_time_slots)})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _change_slot_status(session, criteria, from_status, to_status):
+    # Flip every slot matching criteria from from_status to to_status with one UPDATE and
+    # return the slots that actually changed. The matching rows are selected first
+    # (row locked) so we can report exactly what the UPDATE touched
+    query = session.query(
+        Schedule.Schedule_ID, Schedule.Barber_User_ID, Schedule.Slot_Date, Schedule.Start_Time, Schedule.End_Time
+    ).filter(Schedule.Status == from_status, *criteria)
+
+    if to_status == 'Available':
+        # Never release a slot an appointment is booked over. Appointments for longer
+        # services cover several slots but only point at the first, so match on time
+        query = query.filter(~exists().where(
+            Appointment.Barber_User_ID == Schedule.Barber_User_ID,
+            Appointment.Appointment_Date_Time < Schedule.End_Time,
+            Appointment.Appointment_End_Date_Time > Schedule.Start_Time,
+        ))
+
+    rows = query.with_for_update().all()
+    if rows:
+        session.query(Schedule).filter(
+            Schedule.Schedule_ID.in_([row[0] for row in rows]),
+            Schedule.Status == from_status
+        ).update({'Status': to_status}, synchronize_session=False)
+    session.commit()
+
+    # Keep this worker's availability index in step with the database
+    changed = []
+    for _, barber_id, day, start, end in rows:
+        availability_index.set_status(barber_id, day, start, end, to_status)
+        changed.append({
+            'barber_id': barber_id,
+            'date': day.isoformat(),
+            'start_time': start.strftime('%H:%M'),
+            'end_time': end.strftime('%H:%M'),
+        })
+    return changed
+
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _at(day, time_str):
+    # Combine a date with an 'HH:MM' time
+    return datetime.combine(day, datetime.strptime(time_str, '%H:%M').time())
+
+
+def _slot_list_criteria(user_id, date, data):
+    # [{"start_time": "HH:MM", "end_time": "HH:MM"}, ...] for one barber and one day
+    day = parse_date(date)
+    pairs = [(_at(day, item.get('start_time')), _at(day, item.get('end_time'))) for item in data]
+    return [
+        Schedule.Barber_User_ID == user_id,
+        Schedule.Slot_Date == day,
+        tuple_(Schedule.Start_Time, Schedule.End_Time).in_(pairs),
+    ]
+
+
+def _slot_range_criteria(data):
+    # {"barber_ids": [...], "dates": ["YYYY-MM-DD", ...], "start": "HH:MM", "end": "HH:MM"}
+    # (barber_id / date are accepted for a single barber or day). Selects every slot
+    # that lies inside the start-end window on any of the dates
+    barber_ids = data.get('barber_ids') or [data['barber_id']]
+    dates = [parse_date(date) for date in (data.get('dates') or [data['date']])]
+    start = data.get('start', '00:00')
+    end = data.get('end', '23:59')
+
+    windows = []
+    for day in dates:
+        windows.append(and_(Schedule.Start_Time >= _at(day, start), Schedule.End_Time <= _at(day, end)))
+
+    return [
+        Schedule.Barber_User_ID.in_(barber_ids),
+        Schedule.Slot_Date.in_(dates),
+        or_(*windows),
+    ]
+
+
+def _update_slots(build_criteria, from_status, to_status):
+    try:
+        session = Session()
+
+        try:
+            criteria = build_criteria(request.get_json())
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify({'error': f'Invalid request: {e}'}), 400
+
+        changed = _change_slot_status(session, criteria, from_status, to_status)
+        return jsonify({'message': 'Schedules updated successfully', 'changed': changed}), 200
+
+    except Exception as e:
+        session.rollback()  # Roll back changes in case of an error
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+@bp.route('/addBlock/<int:user_id>/<string:date>', methods=['PUT'])
+def add_block(user_id, date):
+    return _update_slots(lambda data: _slot_list_criteria(user_id, date, data), 'Available', 'Unavailable')
+
+
+@bp.route('/addBlock/range', methods=['PUT'])
+def add_block_range():
+    return _update_slots(_slot_range_criteria, 'Available', 'Unavailable')
+
+
+@bp.route('/removeBlock/<int:user_id>/<string:date>', methods=['PUT'])
+def remove_block(user_id, date):
+    return _update_slots(lambda data: _slot_list_criteria(user_id, date, data), 'Unavailable', 'Available')
+
+
+@bp.route('/removeBlock/range', methods=['PUT'])
+def remove_block_range():
+    return _update_slots(_slot_range_criteria, 'Unavailable', 'Available')
+
+
+@bp.route('/admin/schedule/generate', methods=['POST'])
+@token_required(roles=['admin'])
+def generate_schedule_records():
+    # Open up Schedule slots for a date range and a set of barbers (all barbers by default)
+    from server.schedule_gen import generate_schedule
+
+    try:
+        session = Session()
+        data = request.get_json() or {}
+
+        result = generate_schedule(
+            session,
+            start_date=data['start_date'],
+            end_date=data['end_date'],
+            barber_ids=data.get('barber_ids'),
+            slot_minutes=int(data.get('slot_minutes', 30)),
+            day_start=data.get('day_start', '09:00'),
+            day_end=data.get('day_end', '17:00'),
+            weekdays=data.get('weekdays'),
+        )
+
+        for barber_id in result['barber_ids']:
+            availability_index.invalidate(barber_id)
+
+        return jsonify(result), 201
+
+    except (KeyError, ValueError) as e:
+        session.rollback()
+        return jsonify({'error': f'Invalid request: {e}'}), 400
+    except Exception as e:
+        session.rollback()
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
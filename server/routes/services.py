@@ -0,0 +1,229 @@
+import logging
+from flask import Blueprint, g, jsonify, request
+from sqlalchemy import and_, select
+from server.classes import User, Service, Barber_Service, Payment_Type, serializer
+from server.cache import reference_cache
+from server.logging_setup import debug_payload
+from server.routes.common import Session, cached_json, token_required
+
+
+# Service catalogue and payment methods, read through the reference cache
+bp = Blueprint('services', __name__)
+
+log = logging.getLogger(__name__)
+
+
+SERVICE = serializer(Service)
+PAYMENT_METHOD = serializer(Payment_Type)
+
+
+def services_statement(user_id=None):
+    # All services, or only those the barber offers. Shared with the async app
+    statement = select(*SERVICE.columns)
+    if user_id is not None:
+        statement = statement.where(Service.barber_services.any(
+            and_(Barber_Service.Barber_User_ID == user_id, Barber_Service.Status == 'Enabled')
+        ))
+    return statement
+
+
+def _load_all_services():
+    session = Session()
+    try:
+        # Query the database to get all services
+        return {"services": SERVICE.dump_all(session.execute(services_statement()))}
+    finally:
+        session.close()
+
+
+def _load_services_for_barber(user_id):
+    session = Session()
+    try:
+        # Query the database to get all services offerd by the barber
+        return {"services": SERVICE.dump_all(session.execute(services_statement(user_id)))}
+    finally:
+        session.close()
+
+
+@bp.route("/services", methods=["GET"])
+def get_all_services():
+    try:
+        # Served from the reference cache, only hits the database after a write or TTL expiry
+        return cached_json(reference_cache.get('services', _load_all_services), 'services')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+
+@bp.route("/services/<int:user_id>", methods=["GET"])
+def get_services_for_barber(user_id):
+    try:
+        return cached_json(reference_cache.get(
+            ('services', user_id), lambda: _load_services_for_barber(user_id)
+        ), 'services')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    
+
+@bp.route('/updateservice/<int:service_id>', methods=['PUT'])
+def update_service(service_id):
+    try:
+        session = Session()
+        data = request.get_json()
+        debug_payload(log, 'updateservice payload', lambda: data)
+        service_id = data.get('Service_ID')
+        new_service_name = data.get('Service_Name')
+        new_service_description = data.get('Service_Description')
+        new_service_price = data.get('Service_Price')
+        new_service_duration = data.get('Service_Duration')
+        
+
+        # Query the database to find the service by ID
+        service = session.query(Service).filter_by(Service_ID=service_id).first()
+
+        if service:
+            # change the old data with the new data
+            service.Service_Name = new_service_name
+            service.Service_Description = new_service_description
+            service.Service_Price = new_service_price
+            service.Service_Duration = new_service_duration
+
+            # Commit changes to the database
+            session.commit()
+            reference_cache.invalidate()
+
+            return jsonify({"success": True, "message": "Service updated successfully"})
+        else:
+            return jsonify({"success": False, "message": "Service not found"}), 404
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        session.close()
+
+
+def _load_payment_methods():
+    session = Session()
+    try:
+        # Query the Payment_Method table to get all payment methods
+        return {'payment_methods': PAYMENT_METHOD.dump_all(session.execute(select(*PAYMENT_METHOD.columns)))}
+    finally:
+        session.close()
+
+
+@bp.route('/payment-methods', methods=['GET'])
+def get_payment_methods():
+    try:
+        return cached_json(reference_cache.get('payment_methods', _load_payment_methods), 'payment_methods')
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+
+
+@bp.route('/services/<int:service_id>/<int:user_id>', methods=['DELETE'])
+@token_required()
+def delete_service(service_id, user_id):
+    # The role comes from the signed token instead of a User query
+    if g.auth['uid'] != user_id:
+        return jsonify({'message': 'Forbidden'}), 403
+
+    if g.auth['role'] != 'admin':
+        # Handle other user roles as needed
+        return jsonify({'message': 'User role not supported for service deletion'}), 403
+
+    try:
+        session = Session()
+
+        # Admin user, perform hard delete of the service
+        service = session.query(Service).filter_by(Service_ID=service_id).first()
+
+        if service:
+            # Delete the service
+            session.delete(service)
+            session.commit()
+            reference_cache.invalidate()
+            return jsonify({'message': 'Service deleted successfully'}), 200
+        else:
+            return jsonify({'message': 'Service not found'}), 404
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+@bp.route('/addservice', methods=['POST'])
+def add_service():
+    try:
+        data = request.get_json()
+        service_name = data.get('Service_Name')
+        service_description = data.get('Service_Description')
+        service_price = data.get('Service_Price')
+        service_duration = data.get('Service_Duration')
+
+        session = Session()
+
+        # Create a new service record
+        new_service = Service(
+            Service_Name=service_name,
+            Service_Description=service_description,
+            Service_Price=service_price,
+            Service_Duration=service_duration
+        )
+
+        # Add the service to the database
+        session.add(new_service)
+
+        # Add the service to the Barber_Service table for all barbers / admin users
+        barbers = session.query(User).filter(User.User_Type.in_(['admin', 'barber'])).all()
+
+        for barber in barbers:
+            barber_service = Barber_Service(
+                Barber_User_ID=barber.User_ID,
+                Service_ID=new_service.Service_ID,
+                Status='Disabled'
+            )
+            session.add(barber_service)
+
+
+        session.commit()
+        reference_cache.invalidate()
+
+        return jsonify({'message': 'Service added successfully'}), 201
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
+
+
+@bp.route('/services/disable/<int:service_id>/<int:user_id>', methods=['PUT'])
+def disable_service(service_id, user_id):
+    try:
+        session = Session()
+
+        # Check if the user making the request is the owner of the service
+        barber_service = (
+            session.query(Barber_Service)
+            .filter_by(Barber_User_ID=user_id, Service_ID=service_id, Status='Enabled')
+            .first()
+        )
+
+        if not barber_service:
+            return jsonify({'message': 'Service not found or already disabled'}), 404
+
+        # Update the 'Status' to 'Disabled'
+        barber_service.Status = 'Disabled'
+        session.commit()
+        reference_cache.invalidate()
+
+        # Close the session
+        session.close()
+
+        return jsonify({'message': 'Service disabled successfully'}), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        session.close()
@@ -0,0 +1,103 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import accumulate
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from .classes import User, Schedule
+
+
+# Bulk Schedule generation.
+#
+# Slot timestamps for every (day, slot) in the range are computed at once with
+# pandas/NumPy instead of one ORM object at a time, and written with chunked
+# executemany inserts. A slot that overlaps one the barber already has (booked or
+# not, of any length) is skipped, so re-running the same range is a no-op and a
+# different slot length never adds free time inside existing slots.
+
+
+def _minutes(value):
+    hours, minutes = value.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def build_slots(start_date, end_date, slot_minutes=30, day_start='09:00', day_end='17:00', weekdays=None):
+    # Returns (dates, start times, end times) as NumPy arrays, one entry per slot
+    days = pd.date_range(start_date, end_date, freq='D')
+    if weekdays is not None:
+        # weekdays uses Monday=0 ... Sunday=6
+        days = days[days.dayofweek.isin(list(weekdays))]
+
+    offsets = np.arange(_minutes(day_start), _minutes(day_end) - slot_minutes + 1, slot_minutes)
+    offsets = offsets.astype('timedelta64[m]')
+
+    starts = (days.values[:, None] + offsets[None, :]).ravel()
+    ends = starts + np.timedelta64(slot_minutes, 'm')
+    day_keys = np.repeat(days.date, len(offsets))
+    return day_keys, starts, ends
+
+
+def generate_schedule(session, start_date, end_date, barber_ids=None, slot_minutes=30,
+                      day_start='09:00', day_end='17:00', weekdays=None, chunk_size=1000):
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+    if end_date < start_date:
+        raise ValueError('end_date must not be before start_date')
+    if slot_minutes <= 0:
+        raise ValueError('slot_minutes must be positive')
+
+    if not barber_ids:
+        barber_ids = [
+            user_id for (user_id,) in
+            session.query(User.User_ID).filter(User.User_Type.in_(['admin', 'barber'])).all()
+        ]
+
+    day_keys, starts, ends = build_slots(start_date, end_date, slot_minutes, day_start, day_end, weekdays)
+    start_times = pd.DatetimeIndex(starts).to_pydatetime()
+    end_times = pd.DatetimeIndex(ends).to_pydatetime()
+
+    # Everything that already exists in the window, so re-runs don't duplicate slots
+    # and booked/blocked time is left untouched
+    range_start = datetime.combine(start_date, datetime.min.time())
+    range_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+    existing = {}
+    for barber_id, start, end in (
+        session.query(Schedule.Barber_User_ID, Schedule.Start_Time, Schedule.End_Time)
+        .filter(
+            Schedule.Barber_User_ID.in_(barber_ids),
+            Schedule.Start_Time < range_end,
+            Schedule.End_Time > range_start,
+        )
+        .order_by(Schedule.Barber_User_ID, Schedule.Start_Time)
+    ):
+        existing.setdefault(barber_id, []).append((start, end))
+
+    rows = []
+    skipped = 0
+    for barber_id in barber_ids:
+        barber_slots = existing.get(barber_id, [])
+        existing_starts = [start for start, _ in barber_slots]
+        # Latest end among the existing slots up to each position
+        latest_ends = list(accumulate((end for _, end in barber_slots), max))
+        for day, start, end in zip(day_keys, start_times, end_times):
+            # Existing slots starting before this one ends overlap it if any ends after it starts
+            before = bisect_left(existing_starts, end)
+            if before and latest_ends[before - 1] > start:
+                skipped += 1
+                continue
+            rows.append({
+                'Barber_User_ID': barber_id,
+                'Day_Of_Week': day.strftime('%Y-%m-%d'),
+                'Slot_Date': day,
+                'Start_Time': start,
+                'End_Time': end,
+                'Status': 'Available',
+            })
+
+    for offset in range(0, len(rows), chunk_size):
+        session.execute(insert(Schedule), rows[offset:offset + chunk_size])
+    session.commit()
+
+    return {'barber_ids': barber_ids, 'created': len(rows), 'skipped': skipped}
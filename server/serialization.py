@@ -0,0 +1,65 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+import orjson
+
+try:
+    import msgpack
+except ImportError:  # optional, JSON only without it
+    msgpack = None
+
+
+# Response encoding.
+#
+# Payloads are plain dicts and lists built by the serializers in server/classes.py,
+# holding the values straight from the database: datetimes and Decimal prices are
+# converted here, by the encoder, not field by field in the routes. JSON is encoded
+# with orjson. Clients that send "Accept: application/msgpack" (the barber app) get
+# MessagePack instead when the msgpack package is installed.
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+_MSGPACK_TYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+
+# Let _default() format datetimes so they keep the "YYYY-MM-DD HH:MM:SS" format the
+# frontend parses, instead of orjson's ISO "T" format. Integer keys (slot numbers,
+# barber ids) become strings as they do with the stdlib encoder
+_JSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat(' ', 'seconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, time):
+        return value.isoformat('seconds')
+    if isinstance(value, Decimal):
+        # Prices are sent as strings so no precision is lost
+        return str(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not serializable')
+
+
+def dumps(payload):
+    return orjson.dumps(payload, default=_default, option=_JSON_OPTIONS)
+
+
+def dumps_msgpack(payload):
+    return msgpack.packb(payload, default=_default)
+
+
+def wants_msgpack(accept):
+    # True when the Accept header asks for MessagePack and we can produce it
+    if msgpack is None or not accept:
+        return False
+    for part in accept.split(','):
+        mimetype, _, params = part.strip().partition(';')
+        if mimetype.strip().lower() in _MSGPACK_TYPES:
+            return params.replace(' ', '') not in ('q=0', 'q=0.0')
+    return False
+
+
+def encode(payload, accept=None):
+    # Returns (body, mimetype) for the client's Accept header
+    if wants_msgpack(accept):
+        return dumps_msgpack(payload), MSGPACK_MIMETYPE
+    return dumps(payload), JSON_MIMETYPE
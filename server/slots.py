@@ -0,0 +1,130 @@
+import heapq
+from itertools import groupby, islice
+from datetime import timedelta
+from sqlalchemy import and_, select
+from .classes import User, Service, Barber_Service, Schedule, parse_duration_minutes
+
+
+# Finding bookable start times for a service.
+#
+# A service longer than one schedule slot needs several back-to-back Available slots.
+# The Available slots of every barber offering the service are read with one range
+# query, ordered by barber and start time. Each barber's slots are merged into free
+# intervals wherever one slot ends as the next begins, and a slot start is offered
+# only when the whole service duration fits inside its interval. Booking one of those
+# start times claims every slot the service overlaps (covering_slots()), including the
+# whole of a last slot it only partly uses, e.g. 45 minutes on 30 minute slots.
+
+
+def service_duration(session, service_id):
+    # (found, minutes). minutes is None when Service_Duration can't be parsed, in which
+    # case every free slot is offered as is
+    row = session.execute(
+        select(Service.Service_Duration_Minutes, Service.Service_Duration).where(Service.Service_ID == service_id)
+    ).first()
+    if row is None:
+        return False, None
+    minutes, text = row
+    # Rows written before the column existed and not yet migrated
+    return True, minutes if minutes is not None else parse_duration_minutes(text)
+
+
+def available_slots_statement(service_id, start_date, end_date):
+    # (barber id, first name, last name, start, end) of every Available slot between the
+    # two dates (inclusive) of the barbers with the service enabled
+    return (
+        select(Schedule.Barber_User_ID, User.F_Name, User.L_Name, Schedule.Start_Time, Schedule.End_Time)
+        .join(User, User.User_ID == Schedule.Barber_User_ID)
+        .join(Barber_Service, and_(
+            Barber_Service.Barber_User_ID == Schedule.Barber_User_ID,
+            Barber_Service.Service_ID == service_id,
+            Barber_Service.Status == 'Enabled',
+        ))
+        .where(
+            User.User_Type.in_(['admin', 'barber']),
+            Schedule.Status == 'Available',
+            Schedule.Slot_Date >= start_date,
+            Schedule.Slot_Date <= end_date,
+        )
+        .order_by(Schedule.Barber_User_ID, Schedule.Start_Time)
+    )
+
+
+def free_intervals(slots):
+    # slots are (start, end) sorted by start. Returns [interval start, interval end,
+    # [(slot start, slot end), ...]] with touching or overlapping slots merged
+    intervals = []
+    for start, end in slots:
+        if intervals and start <= intervals[-1][1]:
+            interval = intervals[-1]
+            interval[1] = max(interval[1], end)
+            interval[2].append((start, end))
+        else:
+            intervals.append([start, end, [(start, end)]])
+    return intervals
+
+
+def covering_slots(slots, start, end):
+    # slots are (schedule id, start, end) sorted by start, those overlapping start-end.
+    # Returns their ids when they run back to back from start to at least end, or None
+    # when they don't
+    if not slots or slots[0][1] != start or slots[-1][2] < end:
+        return None
+    for (_, _, previous_end), (_, next_start, _) in zip(slots, slots[1:]):
+        if next_start != previous_end:
+            return None
+    return [slot[0] for slot in slots]
+
+
+def fitting_starts(intervals, minutes, not_before=None):
+    # Yields (start, end) for every slot start where the service fits, in time order
+    duration = timedelta(minutes=minutes) if minutes else None
+    for _, interval_end, slots in intervals:
+        for start, slot_end in slots:
+            if not_before is not None and start < not_before:
+                continue
+            end = start + duration if duration else slot_end
+            if end <= interval_end:
+                yield start, end
+
+
+def barber_start_times(rows, minutes, not_before=None):
+    # Groups rows from available_slots_statement() by barber. Yields
+    # (barber id, barber name, iterator of fitting (start, end)) per barber
+    for barber_id, barber_rows in groupby(rows, key=lambda row: row[0]):
+        barber_rows = list(barber_rows)
+        barber_name = f'{barber_rows[0][1]} {barber_rows[0][2]}'
+        intervals = free_intervals((row[3], row[4]) for row in barber_rows)
+        yield barber_id, barber_name, fitting_starts(intervals, minutes, not_before)
+
+
+def _labelled(start_times, barber_id, barber_name):
+    for start, end in start_times:
+        yield start, end, barber_id, barber_name
+
+
+def earliest_start_times(rows, minutes, not_before, k):
+    # The k earliest (start, end, barber id, barber name) across all barbers. Each
+    # barber's starts are already in time order, so a heap merge only advances the
+    # barbers whose next start could still be among the k earliest
+    streams = [
+        _labelled(start_times, barber_id, barber_name)
+        for barber_id, barber_name, start_times in barber_start_times(rows, minutes, not_before)
+    ]
+    return list(islice(heapq.merge(*streams), k))
+
+
+def next_start_times(session, service_id, minutes, after, k, days):
+    # earliest_start_times() over the days from after. Reads one day of slots first and
+    # doubles the window until it holds k starts or reaches the horizon, so a busy shop
+    # reads a day or two of slots rather than all of them. A window only cuts off starts
+    # whose service would run past its last day, and those come after every start it
+    # found, so k starts from a window are the k earliest overall
+    window = 1
+    while True:
+        window = min(window, days)
+        statement = available_slots_statement(service_id, after.date(), after.date() + timedelta(days=window - 1))
+        start_times = earliest_start_times(session.execute(statement), minutes, after, k)
+        if len(start_times) == k or window == days:
+            return start_times
+        window *= 2
@@ -0,0 +1,120 @@
+import os
+import sys
+import tempfile
+
+# The app reads its configuration at import time, so point it at a throwaway SQLite
+# file and keep side effects cheap before anything from the project is imported. The
+# fixtures drop every table, so the database is never taken from the environment
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.sqlite3')}"
+os.environ.pop('ASYNC_DATABASE_URL', None)
+os.environ.setdefault('BCRYPT_LOG_ROUNDS', '4')
+os.environ.setdefault('SECRET_KEY', 'test')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# Nothing listens on the discard port, so confirmation emails fail fast without retries
+os.environ.setdefault('SMTP_HOST', '127.0.0.1')
+os.environ.setdefault('SMTP_PORT', '9')
+os.environ.setdefault('SMTP_USE_TLS', 'false')
+os.environ.setdefault('EMAIL_MAX_RETRIES', '0')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime, timedelta  # noqa: E402
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def session():
+    # A fresh schema and empty in-process caches for every test
+    from sqlalchemy.orm import sessionmaker
+    from server.db import Base, engine
+    from server.availability import availability_index
+    from server.cache import reference_cache
+
+    # Belt and braces for the DATABASE_URL override above
+    assert engine.dialect.name == 'sqlite', f'Refusing to drop tables on {engine.url!r}'
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    availability_index.invalidate()
+    reference_cache.invalidate()
+
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def app(session):
+    from server import create_app
+    return create_app({'TESTING': True})
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def shop(session):
+    # A barber, a customer, a 30 and a 60 minute service offered by the barber, and a
+    # payment type. Returns their ids
+    from server.classes import User, Service, Barber_Service, Payment_Type
+
+    barber = User(Username='barber', Password='x', F_Name='Bo', L_Name='Barber', User_Type='barber',
+                  Email='barber@shop.test', Phone_Number='5550000001')
+    customer = User(Username='customer', Password='x', F_Name='Cy', L_Name='Customer', User_Type='customer',
+                    Email='customer@shop.test', Phone_Number='5550000002')
+    short = Service(Service_Name='Trim', Service_Description='Trim', Service_Price=15, Service_Duration='30 minutes')
+    long = Service(Service_Name='Cut', Service_Description='Cut', Service_Price=30, Service_Duration='1 hour')
+    payment = Payment_Type(Payment_Type_Name='Cash')
+    session.add_all([barber, customer, short, long, payment])
+    session.flush()
+    session.add_all([
+        Barber_Service(Barber_User_ID=barber.User_ID, Service_ID=short.Service_ID, Status='Enabled'),
+        Barber_Service(Barber_User_ID=barber.User_ID, Service_ID=long.Service_ID, Status='Enabled'),
+    ])
+    session.commit()
+    return {
+        'barber_id': barber.User_ID,
+        'customer_id': customer.User_ID,
+        'short_service_id': short.Service_ID,
+        'long_service_id': long.Service_ID,
+        'payment_type_id': payment.Payment_Type_ID,
+    }
+
+
+# A day far enough ahead that the routes hiding past slots still show all of it
+FUTURE_DAY = datetime.now().date() + timedelta(days=30)
+
+
+def http_date(day):
+    # The date format the booking form sends
+    return day.strftime('%a, %d %b %Y 00:00:00 GMT')
+
+
+def booking_body(shop, offer, service_id, number=1):
+    # The POST /bookings body for an offer from the availability routes: barber_id,
+    # date (ISO), start_time and end_time. number keeps customer details unique
+    return {
+        'first_name': 'Test', 'last_name': str(number), 'email': f'booking{number}@shop.test',
+        'phone': f'9{number:09d}', 'barber_id': offer['barber_id'],
+        'date': http_date(date.fromisoformat(offer['date'])),
+        'start_time': offer['start_time'], 'end_time': offer['end_time'],
+        'service_id': service_id, 'customer_id': shop['customer_id'],
+        'payment_method': shop['payment_type_id'],
+    }
+
+
+def add_slots(session, barber_id, day, count, start='09:00', minutes=30, status='Available'):
+    # count back-to-back slots on day from start. Returns the Schedule rows
+    from server.classes import Schedule
+
+    slot_start = datetime.combine(day, datetime.strptime(start, '%H:%M').time())
+    slots = []
+    for _ in range(count):
+        slot_end = slot_start + timedelta(minutes=minutes)
+        slots.append(Schedule(Barber_User_ID=barber_id, Day_Of_Week=day.isoformat(), Slot_Date=day,
+                              Start_Time=slot_start, End_Time=slot_end, Status=status))
+        slot_start = slot_end
+    session.add_all(slots)
+    session.commit()
+    return slots
@@ -0,0 +1,30 @@
+import time
+from server.auth import InvalidToken, issue_token, revoke_token, revoke_user, verify_token
+import pytest
+
+
+def test_token_round_trip():
+    data = verify_token(issue_token(7, 'barber'))
+    assert data['uid'] == 7 and data['role'] == 'barber'
+
+
+def test_revoked_token_is_rejected():
+    token = issue_token(8, 'customer')
+    revoke_token(verify_token(token))
+    with pytest.raises(InvalidToken):
+        verify_token(token)
+
+
+def test_revoke_user_rejects_tokens_up_to_the_revocation():
+    # Start early in a second so everything below happens within it
+    time.sleep(1.05 - time.time() % 1)
+    earlier = issue_token(9, 'barber')
+    revoke_user(9)
+    # Minted in the same second as the revocation, so it could carry the old role
+    same_second = issue_token(9, 'barber')
+    for token in (earlier, same_second):
+        with pytest.raises(InvalidToken):
+            verify_token(token)
+
+    time.sleep(1.05 - time.time() % 1)
+    assert verify_token(issue_token(9, 'admin'))['role'] == 'admin'
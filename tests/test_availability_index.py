@@ -0,0 +1,38 @@
+import time
+from datetime import timedelta
+from server.availability import AvailabilityIndex
+from conftest import FUTURE_DAY, add_slots
+
+
+def test_days_are_capped_least_recently_used_first(session, shop):
+    index = AvailabilityIndex(ttl=60, max_days=3)
+    days = [FUTURE_DAY + timedelta(days=i) for i in range(4)]
+    for day in days[:3]:
+        index.slots(shop['barber_id'], day)
+    index.slots(shop['barber_id'], days[0])  # days[1] is now the least recently used
+    index.slots(shop['barber_id'], days[3])
+
+    assert len(index) == 3
+    assert (shop['barber_id'], days[1]) not in index._days
+    assert (shop['barber_id'], days[0]) in index._days
+
+
+def test_expired_days_are_dropped(session, shop):
+    index = AvailabilityIndex(ttl=0.05, max_days=100)
+    for i in range(10):
+        index.slots(999, FUTURE_DAY + timedelta(days=i))  # empty days from arbitrary URLs
+    time.sleep(0.1)
+    index.slots(shop['barber_id'], FUTURE_DAY)
+    assert len(index) == 1
+
+
+def test_available_dates_follow_slot_changes(session, shop):
+    index = AvailabilityIndex(ttl=60)
+    (slot,) = add_slots(session, shop['barber_id'], FUTURE_DAY, 1)
+    assert index.available_dates(shop['barber_id']) == [FUTURE_DAY]
+
+    slot.Status = 'Unavailable'
+    session.commit()
+    index.set_status(shop['barber_id'], FUTURE_DAY, slot.Start_Time, slot.End_Time, 'Unavailable')
+    assert index.available_dates(shop['barber_id']) == []
+    assert index.slots(shop['barber_id'], FUTURE_DAY, status='Available') == []
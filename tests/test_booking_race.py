@@ -0,0 +1,38 @@
+import threading
+from datetime import date
+from server.classes import Appointment
+from conftest import add_slots, booking_body
+
+
+THREADS = 20
+
+
+def test_concurrent_bookings_claim_the_slot_once(session, shop, app):
+    # Many simultaneous bookings for one free slot: exactly one wins, the rest get 409
+    day = date(2030, 1, 7)
+    (slot,) = add_slots(session, shop['barber_id'], day, 1)
+    schedule_id = slot.Schedule_ID
+
+    barrier = threading.Barrier(THREADS)
+    statuses = []
+    lock = threading.Lock()
+
+    def book(number):
+        client = app.test_client()
+        offer = {'barber_id': shop['barber_id'], 'date': day.isoformat(), 'start_time': '09:00', 'end_time': '09:30'}
+        body = booking_body(shop, offer, shop['short_service_id'], number)
+        barrier.wait()
+        response = client.post('/bookings', json=body)
+        with lock:
+            statuses.append(response.status_code)
+
+    workers = [threading.Thread(target=book, args=(i,)) for i in range(THREADS)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    session.expire_all()
+    assert statuses.count(201) == 1
+    assert statuses.count(409) == THREADS - 1
+    assert session.query(Appointment).filter_by(Schedule_ID=schedule_id).count() == 1
@@ -0,0 +1,33 @@
+import time
+from server.cache import ReferenceCache
+
+
+def test_caps_entries_least_recently_used_first():
+    cache = ReferenceCache(ttl=60, max_entries=3)
+    for key in ('a', 'b', 'c'):
+        cache.get(key, lambda: {'key': key})
+    cache.lookup('a')  # 'b' is now the least recently used
+    cache.get('d', lambda: {'key': 'd'})
+
+    assert len(cache) == 3
+    assert cache.lookup('b') is None
+    assert cache.lookup('a') is not None
+
+
+def test_store_drops_expired_entries():
+    cache = ReferenceCache(ttl=0.05, max_entries=100)
+    for i in range(10):
+        cache.get(('barber', i), lambda: [])
+    time.sleep(0.1)
+    cache.get('fresh', lambda: [])
+    assert len(cache) == 1
+
+
+def test_invalidate_makes_entries_miss():
+    cache = ReferenceCache(ttl=60)
+    loads = []
+    cache.get('services', lambda: loads.append(1) or [])
+    cache.get('services', lambda: loads.append(1) or [])
+    cache.invalidate()
+    cache.get('services', lambda: loads.append(1) or [])
+    assert len(loads) == 2
@@ -0,0 +1,51 @@
+from datetime import date
+from sqlalchemy import event
+from server.classes import Appointment
+from server.db import engine
+from conftest import add_slots
+
+
+def _book(session, shop, slots):
+    for i, slot in enumerate(slots):
+        slot.Status = 'Unavailable'
+        session.add(Appointment(
+            F_Name='Walk', L_Name='In', Email=f'a{i}@shop.test', Phone_Number=f'{i:010d}',
+            Customer_User_ID=shop['customer_id'], Barber_User_ID=shop['barber_id'],
+            Appointment_Date_Time=slot.Start_Time, Appointment_End_Date_Time=slot.End_Time,
+            Status='Confirmed', Payment_Type_ID=shop['payment_type_id'],
+            Service_ID=shop['short_service_id'], Schedule_ID=slot.Schedule_ID,
+        ))
+    session.commit()
+
+
+def _count_queries(client, path):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    assert response.status_code == 200
+    return len(statements), response.get_json()['appointments']
+
+
+def test_query_count_does_not_grow_with_appointments(session, shop, client):
+    day = date(2030, 1, 7)
+    other_day = date(2030, 1, 8)
+    _book(session, shop, add_slots(session, shop['barber_id'], day, 1))
+    path = f"/dailyappointments/{shop['barber_id']}/{day.isoformat()}"
+    one_query_count, one = _count_queries(client, path)
+
+    slots = add_slots(session, shop['barber_id'], other_day, 12)
+    session.query(Appointment).delete()
+    session.commit()
+    _book(session, shop, slots)
+    path = f"/dailyappointments/{shop['barber_id']}/{other_day.isoformat()}"
+    many_query_count, many = _count_queries(client, path)
+
+    assert len(one) == 1 and len(many) == 12
+    assert one_query_count == many_query_count == 1
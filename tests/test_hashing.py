@@ -0,0 +1,32 @@
+import os
+import signal
+from server import hashing
+import pytest
+
+
+def test_hash_and_check():
+    pw_hash = hashing.hash_password('secret')
+    assert hashing.check_password(pw_hash, 'secret')
+    assert not hashing.check_password(pw_hash, 'wrong')
+    assert not hashing.check_password('not a hash', 'secret')
+
+
+def test_recovers_after_a_pool_process_dies():
+    hashing.hash_password('warm up')
+    executor = hashing._get_executor()
+    for pid in list(executor._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    # The job in flight (if any) is lost, later calls get a fresh pool
+    try:
+        hashing.hash_password('lost')
+    except hashing.HashingBusy:
+        pass
+    assert hashing.check_password(hashing.hash_password('secret'), 'secret')
+    assert hashing._get_executor() is not executor
+
+
+def test_timeout_is_reported_as_busy(monkeypatch):
+    monkeypatch.setattr(hashing, 'HASHING_TIMEOUT', 0)
+    with pytest.raises(hashing.HashingBusy):
+        hashing.hash_password('slow')
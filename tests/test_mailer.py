@@ -0,0 +1,131 @@
+import smtplib
+import threading
+import time
+from server.mailer import EmailDispatcher
+
+
+class StubSMTP:
+    # Stands in for smtplib.SMTP. Class attributes are reset by the fixture below
+
+    connections = []
+    failures = 0  # sendmail() calls to fail before succeeding
+    gate = None  # when set, sendmail() waits on it
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.closed = False
+        StubSMTP.connections.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def sendmail(self, sender, recipient, message):
+        if StubSMTP.gate is not None:
+            StubSMTP.gate.wait()
+        if StubSMTP.failures:
+            StubSMTP.failures -= 1
+            raise smtplib.SMTPServerDisconnected('stub disconnect')
+        self.sent.append((sender, recipient, message))
+
+    def quit(self):
+        self.closed = True
+
+    close = quit
+
+
+def _dispatcher(**kwargs):
+    StubSMTP.connections = []
+    StubSMTP.failures = 0
+    StubSMTP.gate = None
+    options = dict(host='localhost', port=25, use_tls=False, workers=1, backoff=0, smtp_factory=StubSMTP)
+    options.update(kwargs)
+    return EmailDispatcher(**options)
+
+
+def test_sends_over_one_connection():
+    dispatcher = _dispatcher()
+    for i in range(5):
+        assert dispatcher.submit('shop@test', f'c{i}@test', 'hello')
+    dispatcher.join()
+    dispatcher.stop()
+
+    assert len(StubSMTP.connections) == 1
+    assert len(StubSMTP.connections[0].sent) == 5
+    assert StubSMTP.connections[0].closed
+    stats = dispatcher.stats()
+    assert stats['sent'] == 5 and stats['failed'] == 0
+
+
+def test_retries_on_a_new_connection():
+    dispatcher = _dispatcher(max_retries=2)
+    StubSMTP.failures = 2
+    dispatcher.submit('shop@test', 'c@test', 'hello')
+    dispatcher.join()
+    dispatcher.stop()
+
+    # Each failure drops the connection and the next attempt reconnects
+    assert len(StubSMTP.connections) == 3
+    assert StubSMTP.connections[-1].sent == [('shop@test', 'c@test', 'hello')]
+    stats = dispatcher.stats()
+    assert stats['sent'] == 1 and stats['retries'] == 2 and stats['connections_opened'] == 3
+
+
+def test_gives_up_after_max_retries():
+    dispatcher = _dispatcher(max_retries=1)
+    StubSMTP.failures = 5
+    dispatcher.submit('shop@test', 'c@test', 'hello')
+    dispatcher.join()
+    dispatcher.stop()
+
+    stats = dispatcher.stats()
+    assert stats['sent'] == 0 and stats['failed'] == 1 and stats['retries'] == 1
+
+
+def test_reconnects_after_idle_timeout():
+    dispatcher = _dispatcher(idle_timeout=0.05)
+    dispatcher.submit('shop@test', 'a@test', 'hello')
+    dispatcher.join()
+    time.sleep(0.2)
+    dispatcher.submit('shop@test', 'b@test', 'hello')
+    dispatcher.join()
+    dispatcher.stop()
+
+    assert len(StubSMTP.connections) == 2
+    assert StubSMTP.connections[0].closed
+
+
+def test_drops_when_queue_is_full():
+    dispatcher = _dispatcher(queue_size=1)
+    StubSMTP.gate = threading.Event()
+    dispatcher.submit('shop@test', 'a@test', 'hello')  # taken by the worker, which blocks
+    time.sleep(0.05)
+    assert dispatcher.submit('shop@test', 'b@test', 'hello')
+    assert not dispatcher.submit('shop@test', 'c@test', 'hello')
+    assert dispatcher.stats()['dropped'] == 1
+    StubSMTP.gate.set()
+    dispatcher.join()
+    dispatcher.stop()
+
+
+def test_stop_with_full_queue_does_not_hang():
+    dispatcher = _dispatcher(workers=2, queue_size=2)
+    StubSMTP.gate = threading.Event()
+    # Both workers block mid-send, then the queue fills up behind them
+    dispatcher.submit('shop@test', 'a@test', 'hello')
+    dispatcher.submit('shop@test', 'b@test', 'hello')
+    time.sleep(0.05)
+    assert dispatcher.submit('shop@test', 'c@test', 'hello')
+    assert dispatcher.submit('shop@test', 'd@test', 'hello')
+
+    started = time.monotonic()
+    stopper = threading.Thread(target=dispatcher.stop, kwargs={'timeout': 0.5}, daemon=True)
+    stopper.start()
+    stopper.join(2)
+    assert not stopper.is_alive()
+    assert time.monotonic() - started < 2
+
+    StubSMTP.gate.set()
+    dispatcher.join()
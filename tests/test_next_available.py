@@ -0,0 +1,85 @@
+from datetime import datetime, time, timedelta, timezone
+from server.classes import Schedule
+from conftest import FUTURE_DAY, add_slots, booking_body
+
+
+def _next_available(client, shop, **params):
+    query = '&'.join(f'{key}={value}' for key, value in params.items())
+    return client.get(f"/service/{shop['long_service_id']}/next-available?{query}")
+
+
+def test_returns_the_k_earliest_across_barbers(session, shop, client):
+    from server.classes import User, Barber_Service
+    other = User(Username='other', Password='x', F_Name='Oz', L_Name='Other', User_Type='barber',
+                 Email='other@shop.test', Phone_Number='5550000003')
+    session.add(other)
+    session.flush()
+    session.add(Barber_Service(Barber_User_ID=other.User_ID, Service_ID=shop['long_service_id'], Status='Enabled'))
+    session.commit()
+    add_slots(session, shop['barber_id'], FUTURE_DAY, 4, start='10:00')
+    add_slots(session, other.User_ID, FUTURE_DAY, 3, start='09:00')
+
+    response = _next_available(client, shop, after=f'{FUTURE_DAY}T00:00', k=3)
+    assert response.status_code == 200
+    assert [(slot['barber_id'], slot['start_time'], slot['end_time']) for slot in response.get_json()] == [
+        (other.User_ID, '09:00', '10:00'), (other.User_ID, '09:30', '10:30'), (shop['barber_id'], '10:00', '11:00'),
+    ]
+
+
+def test_accepts_timezone_aware_after(session, shop, client):
+    add_slots(session, shop['barber_id'], FUTURE_DAY, 4)
+    # Midnight UTC the day before is before FUTURE_DAY's slots in any local timezone
+    after = datetime.combine(FUTURE_DAY - timedelta(days=1), time(), tzinfo=timezone.utc)
+    after = after.isoformat().replace('+00:00', 'Z')
+
+    response = _next_available(client, shop, after=after, k=2)
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+
+
+def test_widens_the_window_until_it_has_k_starts(session, shop, client):
+    from sqlalchemy import event
+    from server.db import engine
+
+    add_slots(session, shop['barber_id'], FUTURE_DAY, 2)
+    add_slots(session, shop['barber_id'], FUTURE_DAY + timedelta(days=5), 3)
+    windows = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if 'Barber_Service' in statement and 'Slot_Date' in statement:
+            windows.append(parameters)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        # One day holds the first start, a week more are needed for the next two
+        response = _next_available(client, shop, after=f'{FUTURE_DAY}T00:00', k=3)
+        assert [(slot['date'], slot['start_time']) for slot in response.get_json()] == [
+            (FUTURE_DAY.isoformat(), '09:00'),
+            ((FUTURE_DAY + timedelta(days=5)).isoformat(), '09:00'),
+            ((FUTURE_DAY + timedelta(days=5)).isoformat(), '09:30'),
+        ]
+        assert len(windows) == 4  # 1, 2, 4 and 8 days
+
+        # The first day has them all
+        del windows[:]
+        response = _next_available(client, shop, after=f'{FUTURE_DAY}T00:00', k=1)
+        assert len(response.get_json()) == 1
+        assert len(windows) == 1
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def test_rejects_bad_parameters(shop, client):
+    assert _next_available(client, shop, k=0).status_code == 400
+    assert _next_available(client, shop, after='soon').status_code == 400
+    assert client.get('/service/999/next-available').status_code == 404
+
+
+def test_result_can_be_booked(session, shop, client):
+    add_slots(session, shop['barber_id'], FUTURE_DAY, 2)
+    (offer,) = _next_available(client, shop, after=f'{FUTURE_DAY}T00:00', k=1).get_json()
+
+    response = client.post('/bookings', json=booking_body(shop, offer, shop['long_service_id']))
+    assert response.status_code == 201
+    session.expire_all()
+    assert session.query(Schedule).filter_by(Status='Available').count() == 0
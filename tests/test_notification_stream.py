@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime
+from server.auth import issue_token, verify_token
+from server.notify_hub import hub
+
+
+def _stream_token(client, user_id, role='barber'):
+    response = client.post(f'/notifications/{user_id}/stream-token',
+                           headers={'Authorization': f'Bearer {issue_token(user_id, role)}'})
+    assert response.status_code == 200
+    return response.get_json()['stream_token']
+
+
+def _stream_path(shop, client):
+    return f"/notifications/{shop['barber_id']}/stream?stream_token={_stream_token(client, shop['barber_id'])}"
+
+
+def _add_notification(session, user_id, message):
+    from server.classes import Notification
+    notification = Notification(User_ID=user_id, Appointment_ID=1, Message=message, Notification_Type='Booking',
+                                Notification_Date_Time=datetime.now(), Notification_Status='Unread')
+    session.add(notification)
+    session.commit()
+    return notification.Notification_ID
+
+
+def test_stream_rejects_session_tokens_in_the_url(shop, client):
+    session_token = issue_token(shop['barber_id'], 'barber')
+    assert client.get(f"/notifications/{shop['barber_id']}/stream?token={session_token}").status_code == 401
+    assert client.get(f"/notifications/{shop['barber_id']}/stream?stream_token={session_token}").status_code == 401
+
+
+def test_stream_tokens_only_open_their_own_stream(shop, client):
+    stream_token = _stream_token(client, shop['customer_id'], 'customer')
+    assert client.get(f"/notifications/{shop['barber_id']}/stream?stream_token={stream_token}").status_code == 401
+    # ...and are no good as session tokens
+    assert client.get(f"/notifications/{shop['customer_id']}",
+                      headers={'Authorization': f'Bearer {stream_token}'}).status_code == 401
+
+
+def test_stream_token_needs_the_users_session(shop, client):
+    response = client.post(f"/notifications/{shop['barber_id']}/stream-token",
+                           headers={'Authorization': f"Bearer {issue_token(shop['customer_id'], 'customer')}"})
+    assert response.status_code == 403
+
+
+def test_logging_out_revokes_stream_tokens(shop, client):
+    from server.auth import revoke_token
+    session_token = issue_token(shop['barber_id'], 'barber')
+    response = client.post(f"/notifications/{shop['barber_id']}/stream-token",
+                           headers={'Authorization': f'Bearer {session_token}'})
+    stream_token = response.get_json()['stream_token']
+    revoke_token(verify_token(session_token))
+    assert client.get(f"/notifications/{shop['barber_id']}/stream?stream_token={stream_token}").status_code == 401
+
+
+def test_head_requests_release_their_stream_slot(shop, client, monkeypatch):
+    monkeypatch.setattr(hub, 'max_streams', 2)
+    for _ in range(5):
+        response = client.head(_stream_path(shop, client))
+        response.close()
+        assert response.status_code == 200
+    assert hub.stream_count() == 0
+
+
+def test_streams_over_the_cap_get_503(shop, client, monkeypatch):
+    monkeypatch.setattr(hub, 'max_streams', 1)
+    first = client.get(_stream_path(shop, client), buffered=False)
+    assert first.status_code == 200
+    assert next(first.response) == b'retry: 3000\n\n'
+
+    second = client.get(_stream_path(shop, client))
+    assert second.status_code == 503
+
+    first.close()
+    assert hub.stream_count() == 0
+    third = client.get(_stream_path(shop, client), buffered=False)
+    assert third.status_code == 200
+    third.close()
+
+
+def test_async_stream_replays_and_delivers_notifications_from_any_process(shop, session, client, monkeypatch):
+    # Notifications committed straight to the database, as another worker would,
+    # reach the async app's stream through its poller
+    from server.async_app import create_async_app
+    from server.async_db import dispose_async_engine
+    from server.async_notify import hub as async_hub
+
+    monkeypatch.setattr(async_hub, 'poll_seconds', 0.05)
+    barber_id = shop['barber_id']
+    missed_id = _add_notification(session, barber_id, 'missed')
+    path = f'/notifications/{barber_id}/stream?stream_token={_stream_token(client, barber_id)}'
+
+    async def receive_until(connection, text):
+        received = b''
+        while text.encode() not in received:
+            received += await asyncio.wait_for(connection.receive(), 5)
+        return received.decode()
+
+    async def run():
+        app = create_async_app({'TESTING': True})
+        try:
+            async with app.test_client().request(path, headers={'Last-Event-ID': str(missed_id - 1)}) as connection:
+                await connection.send_complete()
+                received = await receive_until(connection, 'retry: 3000')
+                assert f'id: {missed_id}\n' in received
+
+                new_id = _add_notification(session, barber_id, 'new')
+                _add_notification(session, shop['customer_id'], 'not for the barber')
+                received = await receive_until(connection, f'id: {new_id}\n')
+                assert 'not for the barber' not in received
+                await connection.disconnect()
+            for _ in range(50):
+                if async_hub.stream_count() == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert async_hub.stream_count() == 0
+        finally:
+            await dispose_async_engine()
+
+    asyncio.run(run())
+
+
+def test_async_stream_checks_the_stream_token(shop, client):
+    from server.async_app import create_async_app
+    from server.async_db import dispose_async_engine
+
+    async def run():
+        app = create_async_app({'TESTING': True})
+        try:
+            session_token = issue_token(shop['barber_id'], 'barber')
+            response = await app.test_client().get(f"/notifications/{shop['barber_id']}/stream?token={session_token}")
+            assert response.status_code == 401
+        finally:
+            await dispose_async_engine()
+
+    asyncio.run(run())
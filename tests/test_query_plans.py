@@ -0,0 +1,9 @@
+import pytest
+from server.migrations import explain_hot_queries, hot_queries
+
+
+@pytest.mark.parametrize('name', sorted(hot_queries()))
+def test_hot_query_uses_an_index(session, name):
+    # Needs an empty schema with the models' indexes, which the session fixture creates
+    plan, uses_index = explain_hot_queries()[name]
+    assert uses_index, plan
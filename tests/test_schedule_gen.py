@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from server.classes import Schedule
+from server.schedule_gen import generate_schedule
+from conftest import FUTURE_DAY, add_slots
+
+
+def _slots(session, barber_id):
+    session.expire_all()
+    return [
+        (start.strftime('%H:%M'), end.strftime('%H:%M'), status)
+        for start, end, status in session.query(Schedule.Start_Time, Schedule.End_Time, Schedule.Status)
+        .filter_by(Barber_User_ID=barber_id).order_by(Schedule.Start_Time)
+    ]
+
+
+def test_rerunning_the_same_range_adds_nothing(session, shop):
+    first = generate_schedule(session, FUTURE_DAY, FUTURE_DAY, barber_ids=[shop['barber_id']], day_end='11:00')
+    second = generate_schedule(session, FUTURE_DAY, FUTURE_DAY, barber_ids=[shop['barber_id']], day_end='11:00')
+    assert first['created'] == 4
+    assert second['created'] == 0 and second['skipped'] == 4
+
+
+def test_skips_slots_inside_existing_longer_slots(session, shop):
+    # A booked 60 minute slot from 09:00, then 30 minute slots generated over the morning
+    add_slots(session, shop['barber_id'], FUTURE_DAY, 1, start='09:00', minutes=60, status='Unavailable')
+    result = generate_schedule(session, FUTURE_DAY, FUTURE_DAY, barber_ids=[shop['barber_id']], day_end='11:00')
+
+    assert result['created'] == 2 and result['skipped'] == 2
+    assert _slots(session, shop['barber_id']) == [
+        ('09:00', '10:00', 'Unavailable'), ('10:00', '10:30', 'Available'), ('10:30', '11:00', 'Available'),
+    ]
+
+
+def test_skips_slots_overlapping_a_different_slot_length(session, shop):
+    generate_schedule(session, FUTURE_DAY, FUTURE_DAY, barber_ids=[shop['barber_id']], day_end='10:30', slot_minutes=45)
+    result = generate_schedule(session, FUTURE_DAY, FUTURE_DAY, barber_ids=[shop['barber_id']], day_end='11:00')
+
+    # 09:00-09:45 and 09:45-10:30 exist, so only 10:30-11:00 is free
+    assert result['created'] == 1
+    assert _slots(session, shop['barber_id'])[-1] == ('10:30', '11:00', 'Available')
+
+
+def test_slot_running_over_midnight_into_the_range_is_respected(session, shop):
+    day_before = FUTURE_DAY - timedelta(days=1)
+    late = Schedule(Barber_User_ID=shop['barber_id'], Day_Of_Week=day_before.isoformat(), Slot_Date=day_before,
+                    Start_Time=datetime.combine(day_before, datetime.min.time()) + timedelta(hours=23, minutes=30),
+                    End_Time=datetime.combine(FUTURE_DAY, datetime.min.time()) + timedelta(minutes=30),
+                    Status='Unavailable')
+    session.add(late)
+    session.commit()
+    result = generate_schedule(session, FUTURE_DAY, FUTURE_DAY, barber_ids=[shop['barber_id']],
+                               day_start='00:00', day_end='01:00')
+    assert result['created'] == 1 and result['skipped'] == 1
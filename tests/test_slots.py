@@ -0,0 +1,131 @@
+from datetime import date, datetime
+from server.classes import Appointment, Schedule, parse_duration_minutes
+from server.slots import covering_slots, fitting_starts, free_intervals
+from conftest import FUTURE_DAY, add_slots, booking_body
+
+
+def at(hhmm):
+    return datetime.combine(date(2030, 1, 7), datetime.strptime(hhmm, '%H:%M').time())
+
+
+def slot(start, end):
+    return at(start), at(end)
+
+
+def test_free_intervals_merges_touching_slots():
+    intervals = free_intervals([slot('09:00', '09:30'), slot('09:30', '10:00'), slot('11:00', '11:30')])
+    assert [(start, end) for start, end, _ in intervals] == [slot('09:00', '10:00'), slot('11:00', '11:30')]
+    assert intervals[0][2] == [slot('09:00', '09:30'), slot('09:30', '10:00')]
+
+
+def test_free_intervals_merges_overlapping_slots():
+    intervals = free_intervals([slot('09:00', '10:00'), slot('09:30', '10:30')])
+    assert [(start, end) for start, end, _ in intervals] == [slot('09:00', '10:30')]
+
+
+def test_free_intervals_of_nothing():
+    assert free_intervals([]) == []
+
+
+def test_fitting_starts_needs_the_whole_duration():
+    intervals = free_intervals([slot('09:00', '09:30'), slot('09:30', '10:00'), slot('11:00', '11:30')])
+    assert list(fitting_starts(intervals, 60)) == [slot('09:00', '10:00')]
+    assert list(fitting_starts(intervals, 30)) == [
+        slot('09:00', '09:30'), slot('09:30', '10:00'), slot('11:00', '11:30'),
+    ]
+    assert list(fitting_starts(intervals, 90)) == []
+
+
+def test_fitting_starts_skips_starts_before_not_before():
+    intervals = free_intervals([slot('09:00', '09:30'), slot('09:30', '10:00'), slot('10:00', '10:30')])
+    assert list(fitting_starts(intervals, 60, not_before=at('09:15'))) == [slot('09:30', '10:30')]
+
+
+def test_fitting_starts_without_a_duration_offers_each_slot():
+    intervals = free_intervals([slot('09:00', '09:30'), slot('09:30', '10:00')])
+    assert list(fitting_starts(intervals, None)) == [slot('09:00', '09:30'), slot('09:30', '10:00')]
+
+
+def test_covering_slots():
+    slots = [(1, *slot('09:00', '09:30')), (2, *slot('09:30', '10:00'))]
+    assert covering_slots(slots, at('09:00'), at('10:00')) == [1, 2]
+    assert covering_slots(slots[:1], at('09:00'), at('10:00')) is None
+    assert covering_slots([(1, *slot('09:00', '09:30')), (3, *slot('09:45', '10:00'))], at('09:00'), at('10:00')) is None
+    assert covering_slots([], at('09:00'), at('10:00')) is None
+    # A 45 minute service claims the whole of the second slot
+    assert covering_slots(slots, at('09:00'), at('09:45')) == [1, 2]
+    assert covering_slots(slots, at('09:15'), at('10:00')) is None
+
+
+def test_parse_duration_minutes():
+    assert parse_duration_minutes('30 minutes') == 30
+    assert parse_duration_minutes('1h 30m') == 90
+    assert parse_duration_minutes('1.5 hours') == 90
+    assert parse_duration_minutes('1:30') == 90
+    assert parse_duration_minutes('45') == 45
+    assert parse_duration_minutes('a while') is None
+
+
+def test_multi_slot_offer_can_be_booked(session, shop, client):
+    add_slots(session, shop['barber_id'], FUTURE_DAY, 4)  # 09:00-11:00
+    path = f"/service/{shop['long_service_id']}/availability?start={FUTURE_DAY}&end={FUTURE_DAY}"
+
+    offers = client.get(path).get_json()
+    assert [(offer['start_time'], offer['end_time']) for offer in offers] == [
+        ('09:00', '10:00'), ('09:30', '10:30'), ('10:00', '11:00'),
+    ]
+
+    response = client.post('/bookings', json=booking_body(shop, offers[0], shop['long_service_id']))
+    assert response.status_code == 201
+
+    session.expire_all()
+    statuses = [status for (status,) in session.query(Schedule.Status).order_by(Schedule.Start_Time)]
+    assert statuses == ['Unavailable', 'Unavailable', 'Available', 'Available']
+
+    # An overlapping booking can't claim the slot that is already taken
+    response = client.post('/bookings', json=booking_body(shop, offers[1], shop['long_service_id'], number=2))
+    assert response.status_code == 409
+    session.expire_all()
+    assert session.query(Appointment).count() == 1
+
+    offers = client.get(path).get_json()
+    assert [(offer['start_time'], offer['end_time']) for offer in offers] == [('10:00', '11:00')]
+
+
+def test_service_that_is_not_a_whole_number_of_slots_can_be_booked(session, shop, client):
+    from server.classes import Service, Barber_Service
+    service = Service(Service_Name='Fade', Service_Description='Fade', Service_Price=25, Service_Duration='45 minutes')
+    session.add(service)
+    session.flush()
+    session.add(Barber_Service(Barber_User_ID=shop['barber_id'], Service_ID=service.Service_ID, Status='Enabled'))
+    session.commit()
+    add_slots(session, shop['barber_id'], FUTURE_DAY, 3)  # 09:00-10:30
+
+    path = f'/service/{service.Service_ID}/availability?start={FUTURE_DAY}&end={FUTURE_DAY}'
+    offers = client.get(path).get_json()
+    assert [(offer['start_time'], offer['end_time']) for offer in offers] == [('09:00', '09:45'), ('09:30', '10:15')]
+
+    response = client.post('/bookings', json=booking_body(shop, offers[0], service.Service_ID))
+    assert response.status_code == 201
+
+    # The partly used 09:30 slot is taken too, and removeBlock won't release it
+    session.expire_all()
+    statuses = [status for (status,) in session.query(Schedule.Status).order_by(Schedule.Start_Time)]
+    assert statuses == ['Unavailable', 'Unavailable', 'Available']
+    assert client.get(path).get_json() == []
+    response = client.put(f"/removeBlock/{shop['barber_id']}/{FUTURE_DAY}", json=[
+        {'start_time': '09:30', 'end_time': '10:00'},
+    ])
+    assert response.get_json()['changed'] == []
+
+
+def test_remove_block_keeps_every_slot_of_a_booking(session, shop, client):
+    add_slots(session, shop['barber_id'], FUTURE_DAY, 2)
+    offer = {'barber_id': shop['barber_id'], 'date': FUTURE_DAY.isoformat(), 'start_time': '09:00', 'end_time': '10:00'}
+    assert client.post('/bookings', json=booking_body(shop, offer, shop['long_service_id'])).status_code == 201
+
+    response = client.put(f"/removeBlock/{shop['barber_id']}/{FUTURE_DAY}", json=[
+        {'start_time': '09:00', 'end_time': '09:30'}, {'start_time': '09:30', 'end_time': '10:00'},
+    ])
+    assert response.status_code == 200
+    assert response.get_json()['changed'] == []